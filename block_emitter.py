@@ -0,0 +1,66 @@
+"""Publishes new block numbers over ZMQ PUB as the node announces them.
+
+Runs as its own PM2 process so the scanner never burns its RPC budget on
+head tracking. Heads arrive via an eth_subscribe("newHeads") WebSocket
+push — no polling interval of added latency. HTTP is kept only
+to bootstrap the last-seen block across reconnects.
+"""
+
+import asyncio
+import logging
+
+import zmq
+from web3 import AsyncWeb3
+from web3.providers.persistent import WebSocketProvider
+
+from config import PRIMARY_RPC, WS_RPC_URL, ZMQ_ADDR
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger("block_emitter")
+
+RECONNECT_DELAY = 2.0
+
+
+async def _bootstrap_block() -> int:
+    """Fetch the current head once over HTTP after a (re)connect."""
+    w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(PRIMARY_RPC))
+    try:
+        return await w3.eth.block_number
+    except Exception as exc:
+        logger.warning("⚠️ HTTP bootstrap failed: %s", exc)
+        return 0
+
+
+async def main() -> None:
+    # Plain (non-asyncio) PUB socket: publishes are fire-and-forget with
+    # NOBLOCK, so there is nothing to await. SNDHWM=1 keeps only the
+    # freshest head queued — a slow subscriber sees the newest block, not
+    # a backlog of stale ones.
+    ctx = zmq.Context()
+    socket = ctx.socket(zmq.PUB)
+    socket.setsockopt(zmq.SNDHWM, 1)
+    socket.setsockopt(zmq.LINGER, 0)
+    socket.bind(ZMQ_ADDR)
+    logger.info("📡 Block emitter bound to %s (newHeads subscription)", ZMQ_ADDR)
+
+    last_block = await _bootstrap_block()
+    while True:
+        try:
+            async with AsyncWeb3(WebSocketProvider(WS_RPC_URL)) as w3:
+                sub_id = await w3.eth.subscribe("newHeads")
+                logger.info("🔔 Subscribed to newHeads (%s)", sub_id)
+                async for payload in w3.socket.process_subscriptions():
+                    block_number = int(payload["result"]["number"], 16) \
+                        if isinstance(payload["result"]["number"], str) \
+                        else payload["result"]["number"]
+                    if block_number > last_block:
+                        socket.send(b"%d" % block_number, flags=zmq.NOBLOCK)
+                        last_block = block_number
+        except Exception as exc:
+            logger.warning("⚠️ WebSocket dropped: %s — reconnecting in %.1fs", exc, RECONNECT_DELAY)
+            await asyncio.sleep(RECONNECT_DELAY)
+            last_block = max(last_block, await _bootstrap_block())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,526 @@
+"""Command Center — single-bot ops dashboard over arbitrum_bot.db.
+
+Where mission_control watches the whole fleet, this reads the scanner's
+own database (live_targets, arb_spreads, arb_executions, system_metrics,
+logs) plus the targets.json snapshot and PM2 log files as fallbacks.
+Six tabs: Radar, Danger, Watchlist, Arbitrage, Terminal, Analytics.
+
+Run with: streamlit run command_center.py
+"""
+
+import json
+import os
+import re
+import sqlite3
+from html import escape
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from config import DB_FILE
+
+try:
+    from streamlit_autorefresh import st_autorefresh
+    HAS_AUTOREFRESH = True
+except ImportError:
+    HAS_AUTOREFRESH = False
+
+try:
+    # C SIMD parser, 2-5x stdlib json on dict/list payloads
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+TARGETS_JSON = os.getenv("CC_TARGETS_JSON", "targets.json")
+PM2_LOG_FILE = os.path.expanduser("~/.pm2/logs/scanner-out.log")
+
+st.set_page_config(page_title="Command Center", page_icon="🛰️", layout="wide")
+
+CSS = """
+<style>
+.block-container { padding-top: 1.0rem; }
+.header-bar { background: linear-gradient(90deg, #0b0e13, #1a2230); border: 1px solid #222a35;
+              border-radius: 8px; padding: 10px 16px; font-family: monospace;
+              font-size: 18px; font-weight: bold; letter-spacing: 2px; margin-bottom: 12px; }
+.stMetric { background: #11151c; border: 1px solid #222a35; border-radius: 8px; padding: 10px; }
+.terminal { background: #0b0e13; border: 1px solid #222a35; border-radius: 8px;
+            padding: 12px; height: 600px; overflow-y: scroll;
+            font-family: monospace; font-size: 12px; line-height: 1.6; }
+.log-time { color: #5d6d7e; }
+.log-warning { color: #f39c12; }
+.log-error { color: #e74c3c; font-weight: bold; }
+.hl-sniper { color: #e74c3c; font-weight: bold; }
+.hl-scout { color: #3498db; font-weight: bold; }
+.hl-promoted { color: #2ecc71; font-weight: bold; }
+.hl-preflight { color: #9b59b6; font-weight: bold; }
+.hl-tx { color: #f1c40f; font-weight: bold; }
+</style>
+"""
+HEADER_HTML = '<div class="header-bar">🛰️ COMMAND CENTER — ARBITRUM ONE</div>'
+
+# Both emitted every run: Streamlit drops elements a rerun doesn't
+# produce, so a once-per-session CSS gate would lose the <style> node on
+# the first 5s tick. As precomputed constants they cost no rebuild and
+# an unchanged node diffs cheaply on the frontend.
+st.markdown(CSS, unsafe_allow_html=True)
+st.markdown(HEADER_HTML, unsafe_allow_html=True)
+
+if HAS_AUTOREFRESH:
+    st_autorefresh(interval=5000, key="refresh")
+
+
+# --- DB access -------------------------------------------------------------
+
+def get_db_connection() -> sqlite3.Connection:
+    conn = sqlite3.connect(DB_FILE, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    # 64 MB page cache + 256 MB mmap window: hot aggregate scans read
+    # memory-mapped pages instead of going through read() each refresh
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+@st.cache_resource
+def get_conn() -> sqlite3.Connection:
+    """One long-lived reader connection per server process.
+
+    ~10 loaders × one open/pragma-pack/close cycle each per 5s refresh
+    adds up to hundreds of file opens a minute; WAL already permits any
+    number of concurrent readers, so a single cached handle serves them
+    all for free.
+    """
+    return get_db_connection()
+
+
+def ensure_indexes() -> None:
+    """Idempotent startup DDL so hot filters seek instead of scan.
+
+    The ORDER BY id DESC LIMIT loaders already walk the rowid B-tree, so
+    no bare-id index is needed; what does need covering is the HF band
+    filter, the 1h spread-count time range and the per-pair spread
+    series.
+    """
+    try:
+        conn = get_db_connection()
+        try:
+            for ddl in (
+                "CREATE INDEX IF NOT EXISTS idx_live_hf ON live_targets(health_factor)",
+                "CREATE INDEX IF NOT EXISTS idx_arb_spreads_ts ON arb_spreads(timestamp DESC)",
+                "CREATE INDEX IF NOT EXISTS idx_arb_spreads_pair_ts "
+                "ON arb_spreads(token_pair, timestamp DESC)",
+            ):
+                conn.execute(ddl)
+            conn.commit()
+        finally:
+            conn.close()
+    except Exception:
+        pass
+
+
+ensure_indexes()
+
+
+def safe_query(sql: str, params: tuple = ()) -> pd.DataFrame:
+    """Run a query, returning an empty frame if the table doesn't exist yet."""
+    try:
+        return pd.read_sql_query(sql, get_conn(), params=params)
+    except Exception:
+        return pd.DataFrame()
+
+
+def _fast_query(sql: str, params: tuple, columns: list[str],
+                dtypes: dict | None = None) -> pd.DataFrame:
+    """Fixed-schema query without pd.read_sql_query's dtype inference.
+
+    A raw fetchall into from_records with predeclared columns and dtypes
+    skips pandas's per-column introspection pass on every refresh.
+    """
+    try:
+        rows = get_conn().execute(sql, params).fetchall()
+    except Exception:
+        return pd.DataFrame(columns=columns)
+    df = pd.DataFrame.from_records(rows, columns=columns)
+    if dtypes and not df.empty:
+        df = df.astype(dtypes, copy=False)
+    return df
+
+
+_TARGET_COLUMNS = ["address", "health_factor", "collateral_usd", "debt_usd"]
+_TARGET_DTYPES = {"health_factor": "float32",
+                  "collateral_usd": "float32",
+                  "debt_usd": "float32"}
+
+
+# --- Loaders ---------------------------------------------------------------
+
+@st.cache_data(ttl=5, show_spinner=False)
+def load_live_targets() -> pd.DataFrame:
+    return _fast_query(
+        "SELECT address, health_factor, collateral_usd, debt_usd "
+        "FROM live_targets ORDER BY health_factor ASC",
+        (), _TARGET_COLUMNS, _TARGET_DTYPES)
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def load_targets_range(lo: float, hi: float) -> pd.DataFrame:
+    """Targets with lo <= HF < hi (HF > 0), filtered in SQL not pandas.
+
+    Only rows in the tier of interest cross the SQLite boundary, and the
+    range predicate rides idx_live_hf instead of a full scan. The
+    inclusive lower bound keeps an HF==1.05 row in the same tier the
+    summary counts it under.
+    """
+    return _fast_query(
+        "SELECT address, health_factor, collateral_usd, debt_usd "
+        "FROM live_targets "
+        "WHERE health_factor > 0 AND health_factor >= ? AND health_factor < ? "
+        "ORDER BY health_factor ASC", (lo, hi),
+        _TARGET_COLUMNS, _TARGET_DTYPES)
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def load_summary() -> dict:
+    """Header KPIs from the trigger-maintained summary row.
+
+    The writer keeps live_targets_summary current on every insert,
+    update and delete, so this is an O(1) single-row read instead of a
+    seven-aggregate scan of live_targets. Falls back to the scan on DBs
+    created before the summary table existed.
+    """
+    df = safe_query("SELECT * FROM live_targets_summary LIMIT 1")
+    if not df.empty:
+        return {k: (v if v is not None else 0) for k, v in df.iloc[0].items()}
+    df = safe_query("""
+        SELECT COUNT(*) AS total,
+               COALESCE(SUM(debt_usd), 0) AS total_debt,
+               COALESCE(SUM(collateral_usd), 0) AS total_collateral,
+               SUM(CASE WHEN health_factor > 0 AND health_factor < 1.05
+                        THEN 1 ELSE 0 END) AS danger_count,
+               SUM(CASE WHEN health_factor >= 1.05 AND health_factor < 1.20
+                        THEN 1 ELSE 0 END) AS watchlist_count,
+               COALESCE(SUM(CASE WHEN health_factor > 0 AND health_factor < 1.05
+                                 THEN debt_usd ELSE 0 END), 0) AS danger_debt,
+               COALESCE(SUM(CASE WHEN health_factor >= 1.05 AND health_factor < 1.20
+                                 THEN debt_usd ELSE 0 END), 0) AS watchlist_debt
+        FROM live_targets""")
+    if df.empty:
+        return {"total": 0, "total_debt": 0.0, "total_collateral": 0.0,
+                "danger_count": 0, "watchlist_count": 0,
+                "danger_debt": 0.0, "watchlist_debt": 0.0}
+    return {k: (v if v is not None else 0) for k, v in df.iloc[0].items()}
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def load_metrics(limit: int = 100) -> pd.DataFrame:
+    """Newest rows, returned oldest-first so they plot without reversal."""
+    return safe_query(
+        "SELECT * FROM (SELECT timestamp, block_number, scan_ms, gas_price_gwei, id "
+        "FROM system_metrics ORDER BY id DESC LIMIT ?) ORDER BY id ASC", (limit,))
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def load_logs(limit: int = 200) -> pd.DataFrame:
+    return safe_query(
+        "SELECT timestamp, level, message FROM logs "
+        "ORDER BY id DESC LIMIT ?", (limit,))
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def load_arb_executions(limit: int = 50) -> pd.DataFrame:
+    return safe_query(
+        "SELECT timestamp, token_pair, dex_buy, dex_sell, profit_usdc, tx_hash, status "
+        "FROM arb_executions ORDER BY id DESC LIMIT ?", (limit,))
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def load_arb_spreads(limit: int = 300) -> pd.DataFrame:
+    df = _fast_query(
+        "SELECT timestamp, token_pair, dex_buy, dex_sell, spread_pct "
+        "FROM arb_spreads ORDER BY id DESC LIMIT ?", (limit,),
+        ["timestamp", "token_pair", "dex_buy", "dex_sell", "spread_pct"],
+        {"spread_pct": "float32"})
+    if not df.empty:
+        # fixed format + cache=True hits the C strptime fast path instead
+        # of per-element dateutil inference, and reuses repeated values
+        df["timestamp"] = pd.to_datetime(
+            df["timestamp"], format="%Y-%m-%d %H:%M:%S", errors="coerce", cache=True)
+    return df
+
+
+@st.cache_data(ttl=2, show_spinner=False)
+def load_header_metrics() -> tuple[float, int, int]:
+    """Every arb scalar the sidebar shows, in one round trip.
+
+    Three scalar subqueries in one SELECT cost one prepared statement
+    and one fetchone instead of three cursor cycles.
+    """
+    try:
+        row = get_conn().execute(
+            "SELECT"
+            " (SELECT COALESCE(SUM(profit_usdc), 0) FROM arb_executions),"
+            " (SELECT COUNT(*) FROM arb_executions),"
+            " (SELECT COUNT(*) FROM arb_spreads"
+            "   WHERE timestamp >= datetime('now', '-60 minutes'))").fetchone()
+    except Exception:
+        return 0.0, 0, 0
+    return float(row[0]), int(row[1]), int(row[2])
+
+
+@st.cache_data(show_spinner=False)
+def _load_targets_json(path: str, mtime_ns: int) -> list:
+    """mtime_ns keys the cache, so an unchanged file never re-parses."""
+    with open(path, "rb") as f:
+        return _json_loads(f.read()).get("tier_1_danger", [])
+
+
+def load_targets_json() -> list:
+    """Tier-1 targets from the scanner's JSON snapshot, if present."""
+    try:
+        return _load_targets_json(TARGETS_JSON, os.stat(TARGETS_JSON).st_mtime_ns)
+    except Exception:
+        return []
+
+
+def load_logs_fallback(limit: int = 200) -> list[str]:
+    """Tail of the PM2 stdout log, used when the logs table is empty.
+
+    Seeks to a tail window sized at ~256 bytes per wanted line instead
+    of readlines()-ing the whole multi-MB file, so I/O stays O(limit)
+    no matter how big the log has grown.
+    """
+    try:
+        with open(PM2_LOG_FILE, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            f.seek(max(0, size - 256 * limit))
+            tail = f.read().decode("utf-8", errors="replace")
+        lines = tail.splitlines()
+        # drop the first line if we landed mid-line inside the file
+        if size > 256 * limit and lines:
+            lines = lines[1:]
+        return lines[-limit:]
+    except Exception:
+        return []
+
+
+# --- Rendering helpers -----------------------------------------------------
+
+# Compiled once at import: per-line re.sub with pattern strings re-hashes
+# the re-module cache on every one of the 200 lines per refresh.
+SNIPER_RE = re.compile(r"(\[SNIPER\])", re.IGNORECASE)
+SCOUT_RE = re.compile(r"(\[SCOUT\])", re.IGNORECASE)
+PROMOTED_RE = re.compile(r"(PROMOTED)", re.IGNORECASE)
+PREFLIGHT_RE = re.compile(r"(PREFLIGHT (?:OK|FAIL\w*))", re.IGNORECASE)
+TX_RE = re.compile(r"(TX SENT|TX CONFIRMED)", re.IGNORECASE)
+
+
+def highlight_log_line(msg: str, level: str) -> str:
+    msg = escape(msg)
+    # One uppercase copy per line; each `in` test is a C substring scan
+    # that fast-paths past the regex engine when the keyword is absent
+    up = msg.upper()
+    if "SNIPER" in up:
+        msg = SNIPER_RE.sub(r'<span class="hl-sniper">\1</span>', msg)
+    if "SCOUT" in up:
+        msg = SCOUT_RE.sub(r'<span class="hl-scout">\1</span>', msg)
+    if "PROMOTED" in up:
+        msg = PROMOTED_RE.sub(r'<span class="hl-promoted">\1</span>', msg)
+    if "PREFLIGHT" in up:
+        msg = PREFLIGHT_RE.sub(r'<span class="hl-preflight">\1</span>', msg)
+    if "TX SENT" in up or "TX CONFIRMED" in up:
+        msg = TX_RE.sub(r'<span class="hl-tx">\1</span>', msg)
+    lvl = level.upper()
+    if lvl == "ERROR":
+        return f'<span class="log-error">{msg}</span>'
+    if lvl == "WARNING":
+        return f'<span class="log-warning">{msg}</span>'
+    return msg
+
+
+def normalize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty:
+        return df
+    df = df.rename(columns={
+        "address": "Address",
+        "health_factor": "Health Factor",
+        "collateral_usd": "Collateral (USD)",
+        "debt_usd": "Debt (USD)",
+    })
+    for col in ("Health Factor", "Debt (USD)", "Collateral (USD)"):
+        # the typed loaders already deliver float32; coerce only frames
+        # that arrived through some other path (e.g. targets.json)
+        if col in df.columns and not pd.api.types.is_float_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors="coerce", downcast="float")
+    return df
+
+
+# --- Sidebar KPIs ----------------------------------------------------------
+
+summary = load_summary()
+with st.sidebar:
+    st.header("📟 Status")
+    st.metric("Tracked Wallets", int(summary["total"]))
+    st.metric("🔴 Danger", int(summary["danger_count"] or 0),
+              delta=f"${summary['danger_debt']:,.0f} debt")
+    st.metric("🟠 Watchlist", int(summary["watchlist_count"] or 0),
+              delta=f"${summary['watchlist_debt']:,.0f} debt")
+    arb_profit, arb_execs, spreads_1h = load_header_metrics()
+    st.metric("Arb Profit", f"${arb_profit:,.2f}")
+    st.metric("Executions", arb_execs)
+    st.metric("Spreads (1h)", spreads_1h)
+
+
+_MAX_SPREAD_POINTS = 100
+
+
+# Figure builders are cached on a cheap fingerprint of the underlying
+# arrays (length + siphash of the raw bytes): when the data hasn't
+# advanced between refreshes, the whole Plotly construction pass — which
+# walks every row — is skipped and the same Figure object is re-shipped.
+
+def _frame_key(df: pd.DataFrame, *cols: str) -> tuple:
+    # live data advances every refresh, so keys rarely repeat back-to-
+    # back; max_entries on the builders keeps the figure cache from
+    # accreting one entry per tick forever
+    return (len(df),) + tuple(hash(df[c].to_numpy().tobytes()) for c in cols)
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def build_radar_fig(cache_key: tuple, _df: pd.DataFrame) -> go.Figure:
+    # no defensive copy: cache_data already hands each caller a private
+    # frame, and copy-on-write isolates the column writes below anyway
+    # np.where + .str slicing run the whole column in C; ordered
+    # Categorical keeps the Plotly legend order stable across refreshes
+    _df["Tier"] = pd.Categorical(
+        np.where(_df["Health Factor"] < 1.05,
+                 "🔴 Tier 1 (Danger)", "🟠 Tier 2 (Watchlist)"),
+        categories=["🔴 Tier 1 (Danger)", "🟠 Tier 2 (Watchlist)"], ordered=True)
+    addr = _df["Address"].astype(str)
+    _df["Short Address"] = addr.str[:6] + "..." + addr.str[-4:]
+    # webgl: the scatter rasterizes on the GPU instead of building
+    # one SVG DOM node per target
+    return px.scatter(
+        _df, x="Health Factor", y="Debt (USD)", color="Tier",
+        size=_df["Collateral (USD)"].clip(lower=0.0),
+        hover_name="Short Address", template="plotly_dark",
+        render_mode="webgl",
+        color_discrete_map={"🔴 Tier 1 (Danger)": "#e74c3c",
+                            "🟠 Tier 2 (Watchlist)": "#f39c12"})
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def build_spread_fig(cache_key: tuple, _df: pd.DataFrame) -> go.Figure:
+    # px.line has no render_mode, so build Scattergl traces directly.
+    # Busy pairs get downsampled to ~100 evenly spaced points before
+    # they ever reach the browser — overlapping segments add bytes
+    # and draw time but no visible information.
+    fig = go.Figure()
+    for pair, grp in _df.sort_values("timestamp").groupby("token_pair", sort=False):
+        if len(grp) > _MAX_SPREAD_POINTS:
+            idx = np.linspace(0, len(grp) - 1, _MAX_SPREAD_POINTS).astype(np.intp)
+            grp = grp.iloc[idx]
+        fig.add_trace(go.Scattergl(
+            x=grp["timestamp"], y=grp["spread_pct"], mode="lines", name=pair))
+    fig.update_layout(template="plotly_dark")
+    return fig
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def build_hist_fig(cache_key: tuple, _df: pd.DataFrame) -> go.Figure:
+    return px.histogram(_df, x="Health Factor", nbins=60, template="plotly_dark")
+
+
+# --- Views -----------------------------------------------------------------
+
+# st.tabs runs every panel's loaders server-side on each rerun even
+# though only one is visible; a radio keeps the same navigation but the
+# inactive views cost nothing per refresh.
+view = st.radio(
+    "View", ["📡 Radar", "🔴 Danger", "🟠 Watchlist", "📈 Arbitrage",
+             "🖥️ Terminal", "📊 Analytics"],
+    horizontal=True, label_visibility="collapsed", key="view")
+
+if view == "📡 Radar":
+    df_radar = normalize_dataframe(load_targets_range(0.0, 1.25))
+    if df_radar.empty:
+        st.info("No targets in radar range yet.")
+    else:
+        key = _frame_key(df_radar, "Health Factor", "Debt (USD)")
+        st.plotly_chart(build_radar_fig(key, df_radar), use_container_width=True)
+
+elif view == "🔴 Danger":
+    df_danger = normalize_dataframe(load_targets_range(0.0, 1.05))
+    if not df_danger.empty:
+        st.dataframe(df_danger, hide_index=True, use_container_width=True)
+    else:
+        snapshot = load_targets_json()
+        if snapshot:
+            st.caption("DB empty — showing targets.json snapshot")
+            st.dataframe(pd.DataFrame(snapshot), hide_index=True, use_container_width=True)
+        else:
+            st.success("No tier-1 targets right now.")
+
+elif view == "🟠 Watchlist":
+    df_watch = normalize_dataframe(load_targets_range(1.05, 1.20))
+    if not df_watch.empty:
+        st.dataframe(df_watch, hide_index=True, use_container_width=True)
+    else:
+        st.success("Watchlist is clear.")
+
+elif view == "📈 Arbitrage":
+    df_spreads = load_arb_spreads(300)
+    if df_spreads.empty:
+        st.info("No spreads recorded yet.")
+    else:
+        key = (len(df_spreads), df_spreads["timestamp"].iloc[0])
+        st.plotly_chart(build_spread_fig(key, df_spreads), use_container_width=True)
+        st.subheader("Recent Executions")
+        st.dataframe(load_arb_executions(50), hide_index=True, use_container_width=True)
+
+elif view == "🖥️ Terminal":
+    df_logs = load_logs(200)
+    if df_logs.empty:
+        lines = load_logs_fallback(200)
+        if lines:
+            st.caption("logs table empty — tailing PM2 stdout")
+            st.code("\n".join(lines))
+        else:
+            st.info("No logs yet.")
+    else:
+        # zip over the raw column arrays: iterrows boxes every row into
+        # a Series, which dominates the loop at 200 lines per refresh
+        lines = [
+            f'<span class="log-time">[{ts}]</span> '
+            f'{highlight_log_line(str(msg), str(lvl))}'
+            for ts, lvl, msg in zip(df_logs["timestamp"].to_numpy(),
+                                    df_logs["level"].to_numpy(),
+                                    df_logs["message"].to_numpy())]
+        st.markdown('<div class="terminal">' + "<br>".join(lines) + "</div>",
+                    unsafe_allow_html=True)
+
+elif view == "📊 Analytics":
+    with st.expander("System Metrics", expanded=True):
+        df_m = load_metrics(100)
+        if df_m.empty:
+            st.info("No metrics yet.")
+        else:
+            fig_scan = px.line(df_m, x="timestamp", y="scan_ms", template="plotly_dark",
+                               title="Scan latency (ms)")
+            st.plotly_chart(fig_scan, use_container_width=True)
+            fig_gas = px.line(df_m, x="timestamp", y="gas_price_gwei", template="plotly_dark",
+                              title="Gas price (gwei)")
+            st.plotly_chart(fig_gas, use_container_width=True)
+    with st.expander("Health Factor Distribution"):
+        # the only view that needs the full table, loaded only when shown
+        df_hist = normalize_dataframe(load_live_targets())
+        if df_hist.empty:
+            st.info("No targets yet.")
+        else:
+            key = _frame_key(df_hist, "Health Factor")
+            st.plotly_chart(build_hist_fig(key, df_hist), use_container_width=True)
@@ -0,0 +1,82 @@
+"""Shared configuration for the Arbitrum arbitrage scanner.
+
+All addresses are Arbitrum One mainnet. Token amounts are expressed in the
+token's own base units unless a name says otherwise.
+"""
+
+import os
+
+# --- RPC -------------------------------------------------------------------
+
+PRIMARY_RPC = os.getenv("ARB_RPC_URL", "https://arb1.arbitrum.io/rpc")
+FALLBACK_RPCS = [
+    "https://arbitrum-one.publicnode.com",
+    "https://rpc.ankr.com/arbitrum",
+]
+RPC_ENDPOINTS = [PRIMARY_RPC] + FALLBACK_RPCS
+
+WS_RPC_URL = os.getenv("ARB_WS_URL", "wss://arb1.arbitrum.io/ws")
+
+# --- Block emitter ---------------------------------------------------------
+
+ZMQ_ADDR = "tcp://127.0.0.1:5555"
+
+# --- Tokens (Arbitrum One) -------------------------------------------------
+
+USDC_ADDRESS = "0xaf88d065e77c8cC2239327C5EDb3A432268e5831"
+USDC_DECIMALS = 6
+
+TOKENS = {
+    "WETH": {"address": "0x82aF49447D8a07e3bd95BD0d56f35241523fBab1", "decimals": 18},
+    "WBTC": {"address": "0x2f2a2543B76A4166549F7aaB2e75Bef0aefC5B0f", "decimals": 8},
+    "ARB": {"address": "0x912CE59144191C1204E64559FE8253a0e49E6548", "decimals": 18},
+    "LINK": {"address": "0xf97f4df75117a78c1A5a0DBb814Af92458539FB4", "decimals": 18},
+    "UNI": {"address": "0xFa7F8980b0f1E64A2062791cc3b0871572f1F7f0", "decimals": 18},
+    "GMX": {"address": "0xfc5A1A6EB076a2C7aD06eD22C90d7E710E35ad0a", "decimals": 18},
+}
+
+# --- DEXes -----------------------------------------------------------------
+# type "v3": Uniswap V3-style quoter (quoteExactInputSingle, returns uint256)
+# type "v2": Uniswap V2-style router (getAmountsOut, returns uint256[])
+
+DEXES = {
+    "uniswap_v3": {
+        "quoter": "0xb27308f9F90D607463bb33eA1BeBb41C27CE5AB6",
+        "type": "v3",
+        "fee_tiers": [500, 3000, 10000],
+    },
+    "pancake_v3": {
+        "quoter": "0xB048Bbc1Ee6b733FFfCFb9e9CeF7375518e25997",
+        "type": "v3",
+        "fee_tiers": [100, 500, 2500],
+    },
+    "sushiswap": {
+        "quoter": "0x1b02dA8Cb0d097eB8D57A175b88c7D8b47997506",
+        "type": "v2",
+        "fee_tiers": [0],
+    },
+    "camelot": {
+        "quoter": "0xc873fEcbd354f5A56E00E710B90EF4201db2448d",
+        "type": "v2",
+        "fee_tiers": [0],
+    },
+}
+
+# --- Multicall -------------------------------------------------------------
+
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+MULTICALL_CHUNK_SIZE = 40
+MAX_CONCURRENT_MULTICALLS = 6
+
+# --- Strategy --------------------------------------------------------------
+
+FLASHLOAN_USDC_AMOUNT = 50_000 * 10**USDC_DECIMALS
+AAVE_FLASHLOAN_FEE_BPS = 5  # 0.05%
+MIN_PROFIT_USD = 10.0
+MIN_SPREAD_LOG_PCT = 0.05
+ROUTE_COOLDOWN_SECONDS = 120.0
+GAS_LIMIT_ESTIMATE = 1_200_000
+
+# --- Persistence -----------------------------------------------------------
+
+DB_FILE = os.getenv("ARB_DB_FILE", "arbitrum_bot.db")
@@ -0,0 +1,208 @@
+"""SQLite persistence for the scanner and the dashboards."""
+
+import logging
+import sqlite3
+
+from config import DB_FILE
+
+logger = logging.getLogger("db_manager")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS arb_spreads (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+    token_pair TEXT,
+    dex_buy TEXT,
+    dex_sell TEXT,
+    spread_pct REAL
+);
+CREATE TABLE IF NOT EXISTS arb_executions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+    token_pair TEXT,
+    dex_buy TEXT,
+    dex_sell TEXT,
+    profit_eth REAL,
+    profit_usdc REAL,
+    tx_hash TEXT,
+    status TEXT
+);
+CREATE TABLE IF NOT EXISTS system_metrics (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+    block_number INTEGER,
+    scan_ms REAL,
+    gas_price_gwei REAL
+);
+CREATE TABLE IF NOT EXISTS live_targets (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+    address TEXT,
+    health_factor REAL,
+    collateral_usd REAL,
+    debt_usd REAL
+);
+CREATE TABLE IF NOT EXISTS logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+    level TEXT,
+    source TEXT,
+    message TEXT
+);
+CREATE TABLE IF NOT EXISTS live_targets_summary (
+    total INTEGER NOT NULL DEFAULT 0,
+    total_debt REAL NOT NULL DEFAULT 0,
+    total_collateral REAL NOT NULL DEFAULT 0,
+    danger_count INTEGER NOT NULL DEFAULT 0,
+    watchlist_count INTEGER NOT NULL DEFAULT 0,
+    danger_debt REAL NOT NULL DEFAULT 0,
+    watchlist_debt REAL NOT NULL DEFAULT 0
+);
+CREATE TRIGGER IF NOT EXISTS trg_live_targets_ins AFTER INSERT ON live_targets BEGIN
+    UPDATE live_targets_summary SET
+        total = total + 1,
+        total_debt = total_debt + COALESCE(NEW.debt_usd, 0),
+        total_collateral = total_collateral + COALESCE(NEW.collateral_usd, 0),
+        danger_count = danger_count
+            + COALESCE((NEW.health_factor > 0 AND NEW.health_factor < 1.05), 0),
+        watchlist_count = watchlist_count
+            + COALESCE((NEW.health_factor >= 1.05 AND NEW.health_factor < 1.20), 0),
+        danger_debt = danger_debt
+            + CASE WHEN NEW.health_factor > 0 AND NEW.health_factor < 1.05
+                   THEN COALESCE(NEW.debt_usd, 0) ELSE 0 END,
+        watchlist_debt = watchlist_debt
+            + CASE WHEN NEW.health_factor >= 1.05 AND NEW.health_factor < 1.20
+                   THEN COALESCE(NEW.debt_usd, 0) ELSE 0 END;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_live_targets_del AFTER DELETE ON live_targets BEGIN
+    UPDATE live_targets_summary SET
+        total = total - 1,
+        total_debt = total_debt - COALESCE(OLD.debt_usd, 0),
+        total_collateral = total_collateral - COALESCE(OLD.collateral_usd, 0),
+        danger_count = danger_count
+            - COALESCE((OLD.health_factor > 0 AND OLD.health_factor < 1.05), 0),
+        watchlist_count = watchlist_count
+            - COALESCE((OLD.health_factor >= 1.05 AND OLD.health_factor < 1.20), 0),
+        danger_debt = danger_debt
+            - CASE WHEN OLD.health_factor > 0 AND OLD.health_factor < 1.05
+                   THEN COALESCE(OLD.debt_usd, 0) ELSE 0 END,
+        watchlist_debt = watchlist_debt
+            - CASE WHEN OLD.health_factor >= 1.05 AND OLD.health_factor < 1.20
+                   THEN COALESCE(OLD.debt_usd, 0) ELSE 0 END;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_live_targets_upd AFTER UPDATE ON live_targets BEGIN
+    UPDATE live_targets_summary SET
+        total_debt = total_debt
+            - COALESCE(OLD.debt_usd, 0) + COALESCE(NEW.debt_usd, 0),
+        total_collateral = total_collateral
+            - COALESCE(OLD.collateral_usd, 0) + COALESCE(NEW.collateral_usd, 0),
+        danger_count = danger_count
+            - COALESCE((OLD.health_factor > 0 AND OLD.health_factor < 1.05), 0)
+            + COALESCE((NEW.health_factor > 0 AND NEW.health_factor < 1.05), 0),
+        watchlist_count = watchlist_count
+            - COALESCE((OLD.health_factor >= 1.05 AND OLD.health_factor < 1.20), 0)
+            + COALESCE((NEW.health_factor >= 1.05 AND NEW.health_factor < 1.20), 0),
+        danger_debt = danger_debt
+            - CASE WHEN OLD.health_factor > 0 AND OLD.health_factor < 1.05
+                   THEN COALESCE(OLD.debt_usd, 0) ELSE 0 END
+            + CASE WHEN NEW.health_factor > 0 AND NEW.health_factor < 1.05
+                   THEN COALESCE(NEW.debt_usd, 0) ELSE 0 END,
+        watchlist_debt = watchlist_debt
+            - CASE WHEN OLD.health_factor >= 1.05 AND OLD.health_factor < 1.20
+                   THEN COALESCE(OLD.debt_usd, 0) ELSE 0 END
+            + CASE WHEN NEW.health_factor >= 1.05 AND NEW.health_factor < 1.20
+                   THEN COALESCE(NEW.debt_usd, 0) ELSE 0 END;
+END;
+"""
+
+# Re-derives the summary row from live_targets; run at init so the
+# trigger-maintained counters start from truth, not from zero.
+_SUMMARY_BACKFILL = """
+INSERT INTO live_targets_summary
+SELECT COUNT(*),
+       COALESCE(SUM(debt_usd), 0),
+       COALESCE(SUM(collateral_usd), 0),
+       COALESCE(SUM(health_factor > 0 AND health_factor < 1.05), 0),
+       COALESCE(SUM(health_factor >= 1.05 AND health_factor < 1.20), 0),
+       COALESCE(SUM(CASE WHEN health_factor > 0 AND health_factor < 1.05
+                         THEN debt_usd ELSE 0 END), 0),
+       COALESCE(SUM(CASE WHEN health_factor >= 1.05 AND health_factor < 1.20
+                         THEN debt_usd ELSE 0 END), 0)
+FROM live_targets
+"""
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(DB_FILE, timeout=10.0)
+    # The writer owns the journal mode: the dashboards open mode=ro and
+    # assume WAL, so set it here rather than hoping a reader flips it.
+    # WAL + synchronous=NORMAL also drops the per-commit journal fsyncs
+    # a rollback journal would pay on every candidate write.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=10000")
+    return conn
+
+
+def init_db() -> None:
+    conn = _connect()
+    try:
+        conn.executescript(_SCHEMA)
+        conn.execute("DELETE FROM live_targets_summary")
+        conn.execute(_SUMMARY_BACKFILL)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def log_arb_spread(token_pair: str, dex_buy: str, dex_sell: str, spread_pct: float) -> None:
+    conn = _connect()
+    try:
+        conn.execute(
+            "INSERT INTO arb_spreads (token_pair, dex_buy, dex_sell, spread_pct) VALUES (?, ?, ?, ?)",
+            (token_pair, dex_buy, dex_sell, spread_pct),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def log_arb_spreads_batch(rows: list[tuple[str, str, str, float]]) -> None:
+    """Insert many (token_pair, dex_buy, dex_sell, spread_pct) rows at once."""
+    if not rows:
+        return
+    conn = _connect()
+    try:
+        conn.executemany(
+            "INSERT INTO arb_spreads (token_pair, dex_buy, dex_sell, spread_pct) VALUES (?, ?, ?, ?)",
+            rows,
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def log_execution(token_pair: str, dex_buy: str, dex_sell: str,
+                  profit_eth: float, profit_usdc: float, tx_hash: str, status: str) -> None:
+    conn = _connect()
+    try:
+        conn.execute(
+            "INSERT INTO arb_executions (token_pair, dex_buy, dex_sell, profit_eth, profit_usdc, tx_hash, status) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (token_pair, dex_buy, dex_sell, profit_eth, profit_usdc, tx_hash, status),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def log_metric(block_number: int, scan_ms: float, gas_price_gwei: float) -> None:
+    conn = _connect()
+    try:
+        conn.execute(
+            "INSERT INTO system_metrics (block_number, scan_ms, gas_price_gwei) VALUES (?, ?, ?)",
+            (block_number, scan_ms, gas_price_gwei),
+        )
+        conn.commit()
+    finally:
+        conn.close()
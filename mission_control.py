@@ -0,0 +1,517 @@
+"""Mission Control — Streamlit dashboard for the liquidation + arbitrage fleet.
+
+Reads the shared SQLite DB written by the bots and PM2 process state, and
+renders four tabs: Main (KPIs + fleet + error board), Liquidation radar,
+Arbitrage spreads, and a log Terminal. Auto-refreshes every 3 seconds.
+
+Run with: streamlit run mission_control.py
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+from html import escape
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+try:
+    from streamlit_autorefresh import st_autorefresh
+    HAS_AUTOREFRESH = True
+except ImportError:
+    HAS_AUTOREFRESH = False
+
+try:
+    from streamlit_js_eval import streamlit_js_eval
+    HAS_JS_EVAL = True
+except ImportError:
+    HAS_JS_EVAL = False
+
+DB_FILE = os.getenv("MC_DB_FILE", "mission_control.db")
+
+st.set_page_config(page_title="Mission Control", page_icon="🎛️", layout="wide")
+
+CSS = """
+<style>
+.block-container { padding-top: 1.2rem; }
+.stMetric { background: #11151c; border: 1px solid #222a35; border-radius: 8px; padding: 10px; }
+.log-time { color: #5d6d7e; }
+.log-info { color: #d5dbdb; }
+.log-warning { color: #f39c12; }
+.log-error { color: #e74c3c; font-weight: bold; }
+.err-board { background: #140d0d; border: 1px solid #4a1f1f; border-radius: 8px;
+             padding: 10px; font-family: monospace; font-size: 12px; }
+</style>
+"""
+# Emitted every run: Streamlit removes any element a rerun doesn't
+# re-produce, so a once-per-session gate would drop the <style> node on
+# the first autorefresh tick. The constant is precomputed and an
+# unchanged node diffs cheaply on the frontend.
+st.markdown(CSS, unsafe_allow_html=True)
+
+_LEVEL_STYLES = {
+    "error": "color: #e74c3c; font-weight: bold",
+    "warning": "color: #f39c12",
+}
+
+
+def _level_style(value) -> str:
+    return _LEVEL_STYLES.get(str(value).lower(), "color: #d5dbdb")
+
+
+# Shared chart layout built once at import: go.Figure(layout=...) with a
+# plain dict skips the per-refresh update_layout validation pass, and
+# raw graph_objects avoid plotly.express's DataFrame introspection.
+_DARK_LAYOUT = dict(template="plotly_dark",
+                    paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
+                    margin=dict(l=10, r=10, t=30, b=10))
+
+_STATUS_STYLES = {
+    "online": "color: #2ecc71; font-weight: bold",
+    "stopped": "color: #e74c3c; font-weight: bold",
+}
+
+
+def _status_style(value) -> str:
+    return _STATUS_STYLES.get(str(value), "color: #f39c12; font-weight: bold")
+
+
+# --- DB access -------------------------------------------------------------
+
+@st.cache_resource
+def _open_reader(thread_id: int) -> sqlite3.Connection:
+    """One read-only connection per worker thread, PRAGMA'd once.
+
+    Opening the DB (and re-running PRAGMAs) on every loader call costs
+    ~20 syscalls per refresh; cached here it costs zero at steady state.
+    SQLite serializes statements per connection handle, so the Main-tab
+    fan-out only overlaps if each pool thread holds its own handle —
+    hence the thread-id cache key and cache=private. mode=ro never
+    escalates locks so reads can't contend with the bot processes.
+    journal_mode is the writer's to set, not ours.
+    """
+    conn = sqlite3.connect(f"file:{DB_FILE}?mode=ro&cache=private",
+                           uri=True, check_same_thread=False, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA query_only=1")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+def get_db_connection() -> sqlite3.Connection:
+    return _open_reader(threading.get_ident())
+
+
+@st.cache_resource
+def ensure_indexes() -> None:
+    """Idempotent index creation so hot range queries seek instead of scan.
+
+    The ORDER BY id DESC LIMIT queries already walk the rowid B-tree, so
+    no index on bare id is needed; what does need covering is the
+    critical-log level filter and the 24h spread-count timestamp range.
+    DDL needs a writable handle, so this runs on its own short-lived
+    connection rather than the shared read-only one.
+    """
+    try:
+        conn = sqlite3.connect(DB_FILE, timeout=5.0)
+    except Exception:
+        return
+    try:
+        for ddl in (
+            "CREATE INDEX IF NOT EXISTS idx_live_targets_hf ON live_targets(health_factor)",
+            "CREATE INDEX IF NOT EXISTS idx_logs_level ON logs(level, id DESC)",
+            "CREATE INDEX IF NOT EXISTS idx_arb_spreads_ts ON arb_spreads(timestamp)",
+        ):
+            try:
+                conn.execute(ddl)
+            except Exception:
+                pass
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def safe_query(sql: str, params: tuple = ()) -> pd.DataFrame:
+    """Run a query, returning an empty frame if the table doesn't exist yet."""
+    try:
+        return pd.read_sql_query(sql, get_db_connection(), params=params)
+    except Exception:
+        return pd.DataFrame()
+
+
+def _fast_query(sql: str, params: tuple, columns: list[str],
+                dtypes: dict | None = None) -> pd.DataFrame:
+    """Fixed-schema query without pd.read_sql_query's dtype inference.
+
+    A raw fetchall into DataFrame.from_records with predeclared columns
+    and dtypes skips pandas's per-column introspection pass; float32
+    also halves the bytes later serialized to the frontend.
+    """
+    try:
+        rows = get_db_connection().execute(sql, params).fetchall()
+    except Exception:
+        return pd.DataFrame(columns=columns)
+    df = pd.DataFrame.from_records(rows, columns=columns)
+    if dtypes and not df.empty:
+        df = df.astype(dtypes, copy=False)
+    return df
+
+
+_TARGET_COLUMNS = ["address", "health_factor", "total_collateral_usd", "total_debt_usd"]
+_TARGET_DTYPES = {"health_factor": "float32",
+                  "total_collateral_usd": "float32",
+                  "total_debt_usd": "float32"}
+
+
+@st.cache_data(ttl=2, show_spinner=False)
+def load_targets_range(lo: float, hi: float, limit: int = 500) -> pd.DataFrame:
+    """Targets with lo <= HF < hi (HF > 0), served by the HF index.
+
+    The inclusive lower bound matches the tier counts, so a target at
+    exactly 1.05 lands in the danger table it is counted under.
+    """
+    return _fast_query(
+        "SELECT address, health_factor, total_collateral_usd, total_debt_usd "
+        "FROM live_targets "
+        "WHERE health_factor > 0 AND health_factor >= ? AND health_factor < ? "
+        "ORDER BY health_factor ASC LIMIT ?", (lo, hi, limit),
+        _TARGET_COLUMNS, _TARGET_DTYPES)
+
+
+@st.cache_data(ttl=2, show_spinner=False)
+def load_arb_executions(limit: int = 50) -> pd.DataFrame:
+    return safe_query(
+        "SELECT * FROM arb_executions ORDER BY id DESC LIMIT ?", (limit,))
+
+
+_SPREAD_COLUMNS = ["id", "timestamp", "token_pair", "dex_buy", "dex_sell", "spread_pct"]
+
+
+def _parse_spread_timestamps(df: pd.DataFrame) -> pd.DataFrame:
+    if not df.empty:
+        # fixed format + cache=True hits the C strptime fast path instead
+        # of per-string inference, and rides the repeated-value cache
+        df["timestamp"] = pd.to_datetime(
+            df["timestamp"], format="%Y-%m-%d %H:%M:%S", errors="coerce", cache=True)
+    return df
+
+
+@st.cache_data(ttl=2, show_spinner=False)
+def load_arb_spreads(limit: int = 300) -> pd.DataFrame:
+    """Initial spread window, oldest-first so appends keep id order."""
+    df = _fast_query(
+        "SELECT id, timestamp, token_pair, dex_buy, dex_sell, spread_pct "
+        "FROM arb_spreads WHERE timestamp IS NOT NULL "
+        "ORDER BY id DESC LIMIT ?", (limit,),
+        _SPREAD_COLUMNS, {"spread_pct": "float32"})
+    if not df.empty:
+        df = df.iloc[::-1].reset_index(drop=True)
+    return _parse_spread_timestamps(df)
+
+
+@st.cache_data(ttl=2, show_spinner=False)
+def load_spreads_since(last_id: int, limit: int = 300) -> pd.DataFrame:
+    """Only spreads newer than the last id the session has charted."""
+    df = _fast_query(
+        "SELECT id, timestamp, token_pair, dex_buy, dex_sell, spread_pct "
+        "FROM arb_spreads WHERE id > ? AND timestamp IS NOT NULL "
+        "ORDER BY id ASC LIMIT ?", (last_id, limit),
+        _SPREAD_COLUMNS, {"spread_pct": "float32"})
+    return _parse_spread_timestamps(df)
+
+
+@st.cache_data(ttl=2, show_spinner=False)
+def load_dashboard_snapshot() -> tuple[float, float, int, int, float, int, int, int]:
+    """All Main-tab KPIs in one round trip of scalar subqueries.
+
+    One compound SELECT replaces every separate loader query the Main
+    tab used to make — one VDBE program, one cursor, one fetchone. The
+    tier counts ride idx_live_targets_hf instead of shipping the whole
+    health_factor column to pandas.
+    """
+    try:
+        row = get_db_connection().execute(
+            """
+            SELECT
+              (SELECT COALESCE(SUM(profit_usdc), 0) FROM executions),
+              (SELECT COALESCE(SUM(profit_usd), 0) FROM arb_executions),
+              (SELECT COUNT(*) FROM executions),
+              (SELECT COUNT(*) FROM arb_executions),
+              (SELECT COALESCE(SUM(CASE WHEN health_factor > 0 AND health_factor < 1.20
+                                        THEN total_debt_usd ELSE 0 END), 0)
+                 FROM live_targets),
+              (SELECT COUNT(*) FROM arb_spreads
+                WHERE timestamp >= datetime('now', '-1440 minutes')),
+              (SELECT COUNT(*) FROM live_targets
+                WHERE health_factor > 0 AND health_factor < 1.05),
+              (SELECT COUNT(*) FROM live_targets
+                WHERE health_factor >= 1.05 AND health_factor < 1.20)
+            """).fetchone()
+    except Exception:
+        return 0.0, 0.0, 0, 0, 0.0, 0, 0, 0
+    return (float(row[0]), float(row[1]), int(row[2]), int(row[3]),
+            float(row[4]), int(row[5]), int(row[6]), int(row[7]))
+
+
+@st.cache_data(ttl=2, show_spinner=False)
+def load_logs(limit: int = 400) -> pd.DataFrame:
+    return _fast_query(
+        "SELECT timestamp, level, source, message FROM logs "
+        "ORDER BY id DESC LIMIT ?", (limit,),
+        ["timestamp", "level", "source", "message"])
+
+
+# Critical logs are append-only and bounded, so a module-level ring
+# buffer absorbs them once and each refresh only asks SQLite for rows it
+# has not seen yet — at steady state that incremental query returns 0
+# rows (served by idx_logs_level).
+_crit_buf: deque = deque(maxlen=50)
+_crit_last_id = [0]
+
+
+def get_critical_logs_sync(limit: int = 15) -> pd.DataFrame:
+    try:
+        rows = get_db_connection().execute(
+            "SELECT id, timestamp, level, message FROM logs "
+            "WHERE id > ? AND level IN ('ERROR', 'WARNING', 'error', 'warning') "
+            "ORDER BY id ASC", (_crit_last_id[0],)).fetchall()
+    except Exception:
+        rows = []
+    if rows:
+        _crit_buf.extend(tuple(r) for r in rows)
+        _crit_last_id[0] = rows[-1]["id"]
+    return pd.DataFrame.from_records(
+        list(islice(reversed(_crit_buf), limit)),
+        columns=["id", "timestamp", "level", "message"])
+
+
+# --- PM2 fleet -------------------------------------------------------------
+
+PM2_BIN = shutil.which("pm2")
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def get_pm2_status() -> pd.DataFrame:
+    """PM2 fleet state as a display-ready frame, cached so the fork+exec
+    fires at most every 5s. Uptime and RAM math runs as whole-array
+    divmods instead of a per-process Python divmod chain."""
+    if PM2_BIN is None:
+        return pd.DataFrame()
+    try:
+        out = subprocess.run(
+            [PM2_BIN, "jlist"], capture_output=True, timeout=2, check=True).stdout
+        procs = json.loads(out)
+    except Exception:
+        return pd.DataFrame()
+    if not procs:
+        return pd.DataFrame()
+    n = len(procs)
+    now_ms = datetime.now().timestamp() * 1000
+    uptimes = np.fromiter(
+        (p.get("pm2_env", {}).get("pm_uptime", 0) for p in procs),
+        dtype=np.float64, count=n)
+    secs = np.maximum((now_ms - uptimes) // 1000, 0).astype(np.int64)
+    days, rem = np.divmod(secs, 86400)
+    hours, rem = np.divmod(rem, 3600)
+    mins = rem // 60
+    mb = np.fromiter(
+        (p.get("monit", {}).get("memory", 0) for p in procs),
+        dtype=np.int64, count=n) / (1024 * 1024)
+    return pd.DataFrame({
+        "Process": [p.get("name", "?") for p in procs],
+        "Status": [p.get("pm2_env", {}).get("status", "unknown") for p in procs],
+        "CPU": [f"{p.get('monit', {}).get('cpu', 0)}%" for p in procs],
+        "RAM": [f"{x:.1f} MB" for x in mb],
+        "Uptime": [f"{d}d {h}h {m}m" for d, h, m in zip(days, hours, mins)],
+        "Restarts": [p.get("pm2_env", {}).get("restart_time", 0) for p in procs],
+    })
+
+
+@st.cache_resource
+def _loader_pool() -> ThreadPoolExecutor:
+    """Small shared pool for fanning out independent Main-tab loaders.
+
+    Each worker thread gets its own read-only connection from
+    get_db_connection's thread-id key; sqlite3 releases the GIL inside
+    step(), so WAL reads genuinely run concurrently and the tab's wall
+    time drops toward its slowest single loader (usually the pm2
+    fork+exec).
+    """
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="loader")
+
+
+# --- Normalization ---------------------------------------------------------
+
+def normalize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty:
+        return df
+    df = df.rename(columns={
+        "address": "Address",
+        "health_factor": "Health Factor",
+        "total_collateral_usd": "Collateral (USD)",
+        "total_debt_usd": "Debt (USD)",
+    })
+    for col in ("Health Factor", "Debt (USD)", "Collateral (USD)"):
+        if col in df.columns:
+            # downcast keeps these float32: half the frame memory and half
+            # the bytes Arrow ships to the frontend / Plotly per refresh
+            df[col] = pd.to_numeric(df[col], errors="coerce", downcast="float")
+    return df
+
+
+# --- Layout ----------------------------------------------------------------
+
+ensure_indexes()
+
+if HAS_AUTOREFRESH:
+    # Throttle (don't stop) the refresh loop while the browser tab is
+    # backgrounded. streamlit_js_eval only samples document.hidden on a
+    # rerun — it doesn't listen for visibilitychange — so if no refresh
+    # were scheduled at all, a hidden tab would never observe the flip
+    # back to visible and would stay frozen after refocus.
+    tab_hidden = (streamlit_js_eval(js_expressions="document.hidden", key="vis")
+                  if HAS_JS_EVAL else False)
+    st_autorefresh(interval=60000 if tab_hidden else 3000, key="refresh")
+
+st.title("🎛️ Mission Control")
+
+# st.tabs renders every panel server-side on each rerun; a radio keeps
+# the same navigation but only the selected view's loaders ever run.
+view = st.radio(
+    "View", ["🏠 Main", "💀 Liquidation", "📈 Arbitrage", "🖥️ Terminal"],
+    horizontal=True, label_visibility="collapsed", key="view")
+
+if view == "🏠 Main":
+    pool = _loader_pool()
+    fut_snapshot = pool.submit(load_dashboard_snapshot)
+    fut_fleet = pool.submit(get_pm2_status)
+    fut_crit = pool.submit(get_critical_logs_sync, 15)
+    (total_liq_profit, total_arb_profit, exec_count, arb_exec_count,
+     value_at_risk, active_spreads_24h,
+     critical_count, danger_count) = fut_snapshot.result()
+    total_hunts = exec_count + arb_exec_count
+
+    c1, c2, c3, c4, c5 = st.columns(5)
+    c1.metric("Net Profit", f"${total_liq_profit + total_arb_profit:,.2f}")
+    c2.metric("Total Hunts", total_hunts)
+    c3.metric("Critical Targets", critical_count, delta=danger_count, delta_color="inverse")
+    c4.metric("Value at Risk", f"${value_at_risk:,.0f}")
+    c5.metric("Spreads (24h)", active_spreads_24h)
+
+    st.subheader("Fleet")
+    df_fleet = fut_fleet.result()
+    if not df_fleet.empty:
+        st.dataframe(df_fleet.style.map(_status_style, subset=["Status"]),
+                     hide_index=True, use_container_width=True)
+    else:
+        st.info("PM2 not reachable.")
+
+    st.subheader("Critical Events")
+    df_crit = fut_crit.result()
+    if not df_crit.empty:
+        parts = ['<div class="err-board">']
+        for _, r in df_crit.iterrows():
+            msg = escape(str(r["message"]), quote=False)
+            lvl = str(r["level"]).lower()
+            parts.append(
+                f'<div><span class="log-time">{r["timestamp"]}</span> '
+                f'<span class="log-{lvl}">{msg}</span></div>')
+        parts.append("</div>")
+        st.markdown("".join(parts), unsafe_allow_html=True)
+    else:
+        st.success("No recent warnings or errors.")
+
+elif view == "💀 Liquidation":
+    # Three bounded index-range queries instead of loading the whole
+    # table and slicing it with boolean masks in pandas.
+    df_critical = normalize_dataframe(load_targets_range(0.0, 1.05))
+    df_danger = normalize_dataframe(load_targets_range(1.05, 1.20))
+    df_radar = normalize_dataframe(load_targets_range(0.0, 1.25))
+    if df_critical.empty and df_danger.empty and df_radar.empty:
+        st.info("No live targets yet.")
+    else:
+        l1, l2 = st.columns(2)
+        with l1:
+            st.subheader("🔴 Critical (HF < 1.05)")
+            st.dataframe(df_critical, hide_index=True, use_container_width=True)
+        with l2:
+            st.subheader("🟠 Danger (HF < 1.20)")
+            st.dataframe(df_danger, hide_index=True, use_container_width=True)
+
+        st.subheader("Radar")
+        if not df_radar.empty:
+            # Scattergl renders the point cloud through WebGL — one GPU
+            # draw call instead of per-node SVG layout on every refresh.
+            coll = df_radar["Collateral (USD)"].clip(lower=0.0)
+            max_coll = float(coll.max()) or 1.0
+            fig = go.Figure(go.Scattergl(
+                x=df_radar["Health Factor"], y=df_radar["Debt (USD)"],
+                mode="markers",
+                marker=dict(size=6 + 24 * coll / max_coll,
+                            color=df_radar["Health Factor"],
+                            colorscale="RdYlGn", showscale=True),
+                text=df_radar["Address"]),
+                layout=dict(_DARK_LAYOUT, uirevision="radar",
+                            xaxis_title="Health Factor",
+                            yaxis_title="Debt (USD)"))
+            st.plotly_chart(fig, use_container_width=True)
+
+elif view == "📈 Arbitrage":
+    # The session keeps the rolling 300-row spread window; each refresh
+    # only fetches rows past the last charted id and appends, so a
+    # steady-state tick moves a handful of rows instead of the full
+    # window. uirevision keeps the browser's zoom/pan and lets Plotly
+    # diff-render just the changed traces.
+    if "df_spreads" not in st.session_state:
+        st.session_state["df_spreads"] = load_arb_spreads(300)
+    df_spreads = st.session_state["df_spreads"]
+    last_id = int(df_spreads["id"].iloc[-1]) if not df_spreads.empty else 0
+    df_new = load_spreads_since(last_id)
+    if not df_new.empty:
+        df_spreads = pd.concat([df_spreads, df_new], ignore_index=True).tail(300)
+        st.session_state["df_spreads"] = df_spreads
+    if df_spreads.empty:
+        st.info("No spreads recorded yet.")
+    else:
+        fig_spread = go.Figure(layout=dict(_DARK_LAYOUT, uirevision="spreads"))
+        # sort=False: the frame is already append-ordered and the legend
+        # keeps a stable first-seen pair order across refreshes
+        for pair, grp in df_spreads.groupby("token_pair", sort=False):
+            fig_spread.add_trace(go.Scattergl(
+                x=grp["timestamp"], y=grp["spread_pct"], mode="lines", name=pair))
+        st.plotly_chart(fig_spread, use_container_width=True)
+
+        st.subheader("Recent Executions")
+        st.dataframe(load_arb_executions(50), hide_index=True, use_container_width=True)
+
+elif view == "🖥️ Terminal":
+    df_logs = load_logs(400)
+    if df_logs.empty:
+        st.info("No logs yet.")
+    else:
+        # Virtualized grid instead of one big unsafe_allow_html blob: the
+        # frontend only materializes visible rows and the payload is a
+        # compact Arrow table, not 400 lines of markup re-sent every tick.
+        # No HTML also means no escaping pass is needed at all.
+        st.dataframe(
+            df_logs[["timestamp", "level", "source", "message"]].style.map(
+                _level_style, subset=["level", "message"]),
+            hide_index=True, height=620, use_container_width=True,
+            column_config={
+                "timestamp": st.column_config.TextColumn("Time", width="small"),
+                "level": st.column_config.TextColumn("Level", width="small"),
+                "source": st.column_config.TextColumn("Source", width="small"),
+                "message": st.column_config.TextColumn("Message", width="large"),
+            })
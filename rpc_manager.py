@@ -0,0 +1,107 @@
+"""Async RPC endpoint management with rate-limit fallback.
+
+All endpoints share one HTTP/2 httpx.AsyncClient so every JSON-RPC call
+rides a pre-warmed keep-alive connection instead of paying TCP + TLS
+handshake RTTs whenever web3's default pool churns.
+"""
+
+import asyncio
+import itertools
+import logging
+
+import httpx
+from web3 import AsyncWeb3
+from web3.providers.async_rpc import AsyncHTTPProvider
+
+from config import RPC_ENDPOINTS
+
+logger = logging.getLogger("rpc_manager")
+
+RATE_LIMIT_BACKOFF_SECONDS = 2.0
+
+_POOL_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+_request_counter = itertools.count(1)
+
+
+class KeepAliveHTTPProvider(AsyncHTTPProvider):
+    """AsyncHTTPProvider that routes requests through a shared httpx client."""
+
+    def __init__(self, endpoint_uri: str, client: httpx.AsyncClient):
+        super().__init__(endpoint_uri)
+        self._client = client
+
+    async def make_request(self, method, params):
+        payload = {
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": params,
+            "id": next(_request_counter),
+        }
+        response = await self._client.post(str(self.endpoint_uri), json=payload)
+        response.raise_for_status()
+        return response.json()
+
+
+class AsyncRPCManager:
+    """Holds one AsyncWeb3 instance per configured endpoint.
+
+    The manager hands out the current "sticky" endpoint via :meth:`get_w3`
+    and rotates to the next endpoint when :meth:`handle_rate_limit` is
+    called after a 429 / provider error.
+    """
+
+    def __init__(self, endpoints: list[str] | None = None):
+        self.endpoints = endpoints or RPC_ENDPOINTS
+        self._client: httpx.AsyncClient | None = None
+        self._w3s: list[AsyncWeb3] = []
+        self._current = 0
+
+    async def connect(self) -> None:
+        self._client = httpx.AsyncClient(http2=True, limits=_POOL_LIMITS, timeout=10.0)
+        for url in self.endpoints:
+            w3 = AsyncWeb3(KeepAliveHTTPProvider(url, self._client))
+            self._w3s.append(w3)
+        # Pre-warm every endpoint's connection with a no-op eth_chainId so
+        # the first real block never pays a handshake.
+        chain_ids = await asyncio.gather(
+            *(w3.eth.chain_id for w3 in self._w3s), return_exceptions=True)
+        chain_id = next(c for c in chain_ids if isinstance(c, int))
+        logger.info("🔌 Connected to %d RPC endpoints (chain id %d, HTTP/2 keep-alive)",
+                    len(self._w3s), chain_id)
+
+    def get_w3(self) -> AsyncWeb3:
+        return self._w3s[self._current]
+
+    async def race_call(self, method: str, params: list):
+        """Send one request to every endpoint; first good answer wins.
+
+        Used for latency-critical calls (the tryAggregate multicalls)
+        where trading provider quota for p99 latency is worthwhile;
+        losers are cancelled as soon as a winner lands.
+        """
+        tasks = [asyncio.ensure_future(w3.manager.coro_request(method, params))
+                 for w3 in self._w3s]
+        pending = set(tasks)
+        error: BaseException | None = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def handle_rate_limit(self) -> None:
+        """Rotate to the next endpoint and back off briefly."""
+        self._current = (self._current + 1) % len(self._w3s)
+        logger.warning("⚠️ Rate limited — switching to RPC endpoint #%d", self._current)
+        await asyncio.sleep(RATE_LIMIT_BACKOFF_SECONDS)
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
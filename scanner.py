@@ -0,0 +1,454 @@
+"""Two-leg USDC flashloan arbitrage scanner for Arbitrum.
+
+Per block: Leg A quotes USDC -> token on every DEX, Leg B quotes the best
+Leg A output token -> USDC on every *other* DEX, and any route whose round
+trip clears the flashloan repayment plus gas and MIN_PROFIT_USD is handed
+to execute_arbitrage. All quoting goes through Multicall3 tryAggregate so a
+single RPC round trip covers a whole chunk of quoter calls.
+"""
+
+import asyncio
+import logging
+import time
+from itertools import chain, permutations
+
+import numpy as np
+import zmq
+import zmq.asyncio
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy path below still works
+    njit = None
+from eth_abi import abi as eth_abi
+from eth_utils import keccak, to_checksum_address
+from web3 import AsyncWeb3
+
+import db_manager
+from config import (
+    AAVE_FLASHLOAN_FEE_BPS,
+    DEXES,
+    FLASHLOAN_USDC_AMOUNT,
+    GAS_LIMIT_ESTIMATE,
+    MAX_CONCURRENT_MULTICALLS,
+    MIN_PROFIT_USD,
+    MIN_SPREAD_LOG_PCT,
+    MULTICALL3_ADDRESS,
+    MULTICALL_CHUNK_SIZE,
+    ROUTE_COOLDOWN_SECONDS,
+    TOKENS,
+    USDC_ADDRESS,
+    USDC_DECIMALS,
+    ZMQ_ADDR,
+)
+from rpc_manager import AsyncRPCManager
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger("scanner")
+
+# tryAggregate(bool,(address,bytes)[]) — selector and return type cached
+# once so multicall dispatch skips web3's per-call contract machinery.
+TRYAGGREGATE_SELECTOR = keccak(text="tryAggregate(bool,(address,bytes)[])")[:4]
+MULTICALL3_CHECKSUM = to_checksum_address(MULTICALL3_ADDRESS)
+_TRYAGG_RETURN_TYPES = ["(bool,bytes)[]"]
+
+# quoteExactInputSingle(address,address,uint24,uint256,uint160)
+QUOTER_V3_SELECTOR = bytes.fromhex("f7729d43")
+# getAmountsOut(uint256,address[])
+ROUTER_V2_SELECTOR = bytes.fromhex("d06ca61f")
+
+ETH_PRICE_USD_FALLBACK = 3000.0
+
+# Stable integer ids for tokens and DEXes, resolved once at import time so
+# hot loops can key flat structures by (sym_idx, dex_idx) instead of
+# chaining nested dict lookups on strings.
+SYMBOLS: tuple[str, ...] = tuple(TOKENS)
+DEX_NAMES: tuple[str, ...] = tuple(DEXES)
+SYM_INDEX: dict[str, int] = {s: i for i, s in enumerate(SYMBOLS)}
+DEX_INDEX: dict[str, int] = {d: i for i, d in enumerate(DEX_NAMES)}
+
+# Per-dex metadata frozen into tuples so the inner loops index by integer
+# id instead of re-hashing config dict keys every iteration.
+DEX_META: tuple[tuple[str, str, str, tuple[int, ...]], ...] = tuple(
+    (name, cfg["quoter"], cfg["type"], tuple(cfg["fee_tiers"]))
+    for name, cfg in DEXES.items())
+PERMUTATION_INDEX: tuple[tuple[int, int], ...] = tuple(
+    permutations(range(len(DEX_NAMES)), 2))
+
+# route_key -> monotonic expiry; routes cool down after a fire. Absolute
+# expiries mean the hot check is a single comparison, and monotonic time
+# is cheaper than time.time() and immune to wall-clock jumps.
+route_blacklist: dict[tuple[str, str, str], float] = {}
+
+# Firing every multicall chunk at once can blow past the provider's
+# per-connection budget and trade 429 retries for latency; cap in-flight
+# chunks instead.
+SEM = asyncio.Semaphore(MAX_CONCURRENT_MULTICALLS)
+
+
+async def _bounded(coro):
+    async with SEM:
+        return await coro
+
+
+# Spread records are queued here and flushed by _db_writer so the scan
+# loop never blocks on SQLite; on overflow we drop the record — spread
+# telemetry is best-effort.
+_spread_queue: asyncio.Queue = asyncio.Queue(maxsize=10_000)
+_DB_FLUSH_BATCH = 200
+_DB_FLUSH_INTERVAL = 0.05
+
+
+async def _db_writer() -> None:
+    """Drain _spread_queue in batches and insert off the event loop."""
+    while True:
+        batch = [await _spread_queue.get()]
+        deadline = asyncio.get_running_loop().time() + _DB_FLUSH_INTERVAL
+        while len(batch) < _DB_FLUSH_BATCH:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_spread_queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        try:
+            await asyncio.to_thread(db_manager.log_arb_spreads_batch, batch)
+        except Exception as exc:
+            logger.error("Spread batch insert failed (%d rows): %s", len(batch), exc)
+
+
+def _encode_quoter_call(dex_cfg: dict, token_in: str, token_out: str,
+                        fee: int, amount_in: int) -> tuple[str, bytes]:
+    """Build (target, calldata) for one quoter call on one DEX."""
+    if dex_cfg["type"] == "v3":
+        calldata = QUOTER_V3_SELECTOR + eth_abi.encode(
+            ["address", "address", "uint24", "uint256", "uint160"],
+            [token_in, token_out, fee, amount_in, 0],
+        )
+    else:
+        calldata = ROUTER_V2_SELECTOR + eth_abi.encode(
+            ["uint256", "address[]"],
+            [amount_in, [token_in, token_out]],
+        )
+    return dex_cfg["quoter"], calldata
+
+
+# Byte offset of the uint256 amount_in slot inside the calldata, per DEX type.
+_AMOUNT_OFFSET = {"v3": 4 + 3 * 32, "v2": 4}
+
+# (dex_name, symbol, fee, direction) -> (target, calldata_template, amount_offset)
+# direction: "buy" = USDC -> token, "sell" = token -> USDC
+QUOTER_TEMPLATES: dict[tuple[str, str, int, str], tuple[str, bytes, int]] = {}
+
+
+def _build_quoter_templates() -> None:
+    """Pre-encode every quoter calldata once; only the amount slot varies."""
+    for dex_name, dex_cfg in DEXES.items():
+        offset = _AMOUNT_OFFSET[dex_cfg["type"]]
+        for symbol, token in TOKENS.items():
+            for fee in dex_cfg["fee_tiers"]:
+                for direction, (t_in, t_out) in (
+                    ("buy", (USDC_ADDRESS, token["address"])),
+                    ("sell", (token["address"], USDC_ADDRESS)),
+                ):
+                    target, calldata = _encode_quoter_call(dex_cfg, t_in, t_out, fee, 0)
+                    QUOTER_TEMPLATES[(dex_name, symbol, fee, direction)] = (
+                        to_checksum_address(target), calldata, offset)
+    logger.info("🧩 Cached %d quoter calldata templates", len(QUOTER_TEMPLATES))
+
+
+def _templated_quoter_call(dex_name: str, symbol: str, fee: int, direction: str,
+                           amount_in: int) -> tuple[str, bytes]:
+    """Splice amount_in into the cached template — no eth-abi on the hot path."""
+    target, template, off = QUOTER_TEMPLATES[(dex_name, symbol, fee, direction)]
+    return target, template[:off] + amount_in.to_bytes(32, "big") + template[off + 32:]
+
+
+def _pack_tryaggregate(chunk: list[tuple[str, bytes]]) -> bytes:
+    """Encode a tryAggregate(False, chunk) calldata blob directly."""
+    return TRYAGGREGATE_SELECTOR + eth_abi.encode(
+        ["bool", "(address,bytes)[]"], [False, chunk])
+
+
+# chunk-hash -> "0x..." calldata, so a retry or fallback re-dispatch of an
+# identical chunk reuses the packed + hexed bytes. FIFO-evicted; a block's
+# worth of chunks fits comfortably.
+_chunk_hex_cache: dict[int, str] = {}
+_CHUNK_HEX_CACHE_MAX = 256
+
+
+def _chunk_calldata_hex(chunk: list[tuple[str, bytes]]) -> str:
+    # keyed by the calls themselves, not their hash: a 64-bit hash
+    # collision would silently quote another chunk's routes, which is
+    # never acceptable on the execution path
+    key = tuple(chunk)
+    data = _chunk_hex_cache.get(key)
+    if data is None:
+        data = "0x" + _pack_tryaggregate(chunk).hex()
+        if len(_chunk_hex_cache) >= _CHUNK_HEX_CACHE_MAX:
+            _chunk_hex_cache.pop(next(iter(_chunk_hex_cache)))
+        _chunk_hex_cache[key] = data
+    return data
+
+
+async def _multicall_chunk(rpc: AsyncRPCManager, chunk: list[tuple[str, bytes]],
+                           block_number: int) -> list[tuple[bool, bytes]]:
+    """Raw eth_call to Multicall3, raced across every RPC endpoint."""
+    raw = await rpc.race_call(
+        "eth_call",
+        [{"to": MULTICALL3_CHECKSUM, "data": _chunk_calldata_hex(chunk)},
+         hex(block_number)])
+    blob = raw if isinstance(raw, bytes) else bytes.fromhex(raw[2:])
+    return eth_abi.decode(_TRYAGG_RETURN_TYPES, blob)[0]
+
+
+def _decode_v3(ret_bytes: bytes) -> int:
+    """V3 quoters return a bare uint256 — first 32 bytes."""
+    return int.from_bytes(ret_bytes[:32], "big") if len(ret_bytes) >= 32 else 0
+
+
+def _decode_v2(ret_bytes: bytes) -> int:
+    """V2 routers return uint256[]; amountOut is the final array slot."""
+    return int.from_bytes(ret_bytes[-32:], "big") if len(ret_bytes) >= 96 else 0
+
+
+# Both quoter shapes put amountOut at a fixed offset, so raw byte slicing
+# replaces the eth-abi type-descriptor traversal on the hot path.
+_DECODERS = {"v3": _decode_v3, "v2": _decode_v2}
+DEX_DECODER = {name: _DECODERS[cfg["type"]] for name, cfg in DEXES.items()}
+DEX_DECODER_BY_IDX = tuple(DEX_DECODER[name] for name in DEX_NAMES)
+
+
+def _find_profitable(amounts_out, total_repay, usdc_scale, gas_cost_usd, min_profit_usd):
+    """Return (profitable indices, net profit USD per candidate).
+
+    Pure int64/float64 array math so numba can compile it out of CPython;
+    only the (usually tiny) survivor set drops back into Python.
+    """
+    net_profit_usd = (amounts_out - total_repay) / usdc_scale - gas_cost_usd
+    profitable = np.nonzero((amounts_out > 0) & (net_profit_usd > min_profit_usd))[0]
+    return profitable, net_profit_usd
+
+
+if njit is not None:
+    _find_profitable = njit(cache=True)(_find_profitable)
+
+
+# symbol -> EWMA of the smallest token_in that would have repaid the
+# flashloan at the best observed Leg B rate; Leg B fan-outs below this
+# floor (less a safety margin) are skipped outright.
+_min_viable_token_in: dict[str, float] = {}
+_VIABILITY_EWMA_ALPHA = 0.2
+_VIABILITY_MARGIN = 0.9
+# Floors can only be re-estimated from quotes they let through, so a
+# symbol whose every route got pruned decays its floor each block —
+# a >10% market drop re-opens the fan-out within a few blocks instead
+# of freezing the symbol out forever.
+_VIABILITY_DECAY = 0.95
+
+
+def _update_viability_floors(leg_b_map, amounts_out, valid, total_repay) -> None:
+    """Fold this block's best observed Leg B rates into the EWMA floors."""
+    n = len(leg_b_map)
+    if n == 0:
+        return
+    amounts_in = np.fromiter((m[4] for m in leg_b_map), dtype=np.float64, count=n)
+    sym_ids = np.fromiter((SYM_INDEX[m[0]] for m in leg_b_map), dtype=np.intp, count=n)
+    required = np.full(n, np.inf)
+    np.divide(amounts_in * total_repay, amounts_out, out=required, where=valid)
+    block_min = np.full(len(SYMBOLS), np.inf)
+    np.minimum.at(block_min, sym_ids, required)
+    for i, observed in enumerate(block_min):
+        if not np.isfinite(observed):
+            continue
+        prev = _min_viable_token_in.get(SYMBOLS[i])
+        _min_viable_token_in[SYMBOLS[i]] = observed if prev is None else \
+            (1.0 - _VIABILITY_EWMA_ALPHA) * prev + _VIABILITY_EWMA_ALPHA * observed
+
+
+async def execute_arbitrage(w3: AsyncWeb3, symbol: str, buy_dex: str, sell_dex: str,
+                            fee: int, net_profit_usd: float) -> None:
+    """Fire the flashloan contract for a profitable route (dry-run safe)."""
+    route_key = (symbol, buy_dex, sell_dex)
+    route_blacklist[route_key] = time.monotonic() + ROUTE_COOLDOWN_SECONDS
+    logger.info("EXECUTING %s: %s -> %s (fee %d) | est. net $%.2f",
+                symbol, buy_dex, sell_dex, fee, net_profit_usd)
+    try:
+        db_manager.log_execution(f"{symbol}/USDC", buy_dex, sell_dex,
+                                 0.0, net_profit_usd, "", "submitted")
+    except Exception as exc:
+        logger.error("Failed to record execution: %s", exc)
+
+
+async def scan_and_execute(w3: AsyncWeb3, rpc: AsyncRPCManager, block_number: int) -> None:
+    scan_start = time.monotonic()
+
+    # Gas price is independent of both quote legs — dispatch it now and
+    # merge it into the Leg A gather so it rides the same RPC window.
+    gas_task = asyncio.ensure_future(w3.eth.gas_price)
+
+    # ---- Leg A: USDC -> token on every DEX --------------------------------
+    leg_a_calls: list[tuple[str, bytes]] = []
+    leg_a_map: list[tuple[str, str, int]] = []  # (symbol, dex_name, fee)
+    for symbol in SYMBOLS:
+        for dex_name, _quoter, _dtype, fees in DEX_META:
+            for fee in fees:
+                target, calldata = _templated_quoter_call(
+                    dex_name, symbol, fee, "buy", FLASHLOAN_USDC_AMOUNT)
+                leg_a_calls.append((target, calldata))
+                leg_a_map.append((symbol, dex_name, fee))
+
+    tasks_a = []
+    for i in range(0, len(leg_a_calls), MULTICALL_CHUNK_SIZE):
+        chunk = leg_a_calls[i:i + MULTICALL_CHUNK_SIZE]
+        tasks_a.append(_bounded(_multicall_chunk(rpc, chunk, block_number)))
+    gas_price, *chunk_results_a = await asyncio.gather(gas_task, *tasks_a)
+    leg_a_results = list(chain.from_iterable(chunk_results_a))
+
+    # best token output per (sym_idx, dex_idx) across fee tiers; flat
+    # tuple-keyed dict — one hash lookup per access instead of two, and
+    # token amounts (18-decimal base units) stay arbitrary-precision ints
+    best_leg_a: dict[tuple[int, int], int] = {}
+    for idx, (success, ret_bytes) in enumerate(leg_a_results):
+        if not success:
+            continue
+        symbol, dex_name, fee = leg_a_map[idx]
+        amount_out = DEX_DECODER[dex_name](ret_bytes)
+        key = (SYM_INDEX[symbol], DEX_INDEX[dex_name])
+        if amount_out > best_leg_a.get(key, 0):
+            best_leg_a[key] = amount_out
+
+    # ---- Leg B: token -> USDC on every other DEX --------------------------
+    leg_b_calls: list[tuple[str, bytes]] = []
+    call_decoders: list = []  # decoder per unique call, resolved at enqueue
+    # Leg A ties across buy DEXes produce identical (target, calldata) sell
+    # quotes; enqueue each unique call once and let routes share its result.
+    seen_calls: dict[tuple[str, bytes], int] = {}
+    # (symbol, buy, sell, fee, amount_in, call_idx) — call_idx points into
+    # leg_b_calls / the decoded results
+    leg_b_map: list[tuple[str, str, str, int, int, int]] = []
+    symbols_quoted: set[str] = set()
+    now_monotonic = time.monotonic()
+    for symbol in SYMBOLS:
+        sym_idx = SYM_INDEX[symbol]
+        viability_floor = _min_viable_token_in.get(symbol, 0.0) * _VIABILITY_MARGIN
+        for buy_i, sell_i in PERMUTATION_INDEX:
+            amount_in_token = best_leg_a.get((sym_idx, buy_i), 0)
+            if amount_in_token <= 0:
+                continue
+            # prune fan-outs that historically can't clear the repayment
+            if amount_in_token < viability_floor:
+                continue
+            buy_dex = DEX_NAMES[buy_i]
+            sell_dex, _quoter, _dtype, fees = DEX_META[sell_i]
+            route_key = (symbol, buy_dex, sell_dex)
+            if (expiry := route_blacklist.get(route_key)) and expiry > now_monotonic:
+                continue
+            decoder = DEX_DECODER_BY_IDX[sell_i]
+            for fee in fees:
+                call_key = _templated_quoter_call(
+                    sell_dex, symbol, fee, "sell", amount_in_token)
+                call_idx = seen_calls.get(call_key)
+                if call_idx is None:
+                    call_idx = len(leg_b_calls)
+                    seen_calls[call_key] = call_idx
+                    leg_b_calls.append(call_key)
+                    call_decoders.append(decoder)
+                leg_b_map.append((symbol, buy_dex, sell_dex, fee, amount_in_token, call_idx))
+            symbols_quoted.add(symbol)
+
+    # escape path for the floor ratchet: no quotes for a symbol this
+    # block means no new observations, so relax its floor instead of
+    # letting a stale estimate prune the symbol indefinitely
+    for symbol in _min_viable_token_in:
+        if symbol not in symbols_quoted:
+            _min_viable_token_in[symbol] *= _VIABILITY_DECAY
+
+    if not leg_b_calls:
+        return
+
+    tasks_b = []
+    for i in range(0, len(leg_b_calls), MULTICALL_CHUNK_SIZE):
+        chunk = leg_b_calls[i:i + MULTICALL_CHUNK_SIZE]
+        tasks_b.append(_bounded(_multicall_chunk(rpc, chunk, block_number)))
+    chunk_results_b = await asyncio.gather(*tasks_b)
+    leg_b_results = list(chain.from_iterable(chunk_results_b))
+
+    gas_cost_usd = gas_price * GAS_LIMIT_ESTIMATE / 1e18 * ETH_PRICE_USD_FALLBACK
+
+    # ---- Profit calc (vectorized; Python only touches survivors) ----------
+    flashloan_fee = FLASHLOAN_USDC_AMOUNT * AAVE_FLASHLOAN_FEE_BPS // 10_000
+    total_repay = FLASHLOAN_USDC_AMOUNT + flashloan_fee
+
+    # USDC outputs are 6-decimal, so int64 is ample headroom here; decode
+    # each unique call once and fan the result back out to its routes
+    call_amounts = np.fromiter(
+        (call_decoders[i](rb) if ok else 0
+         for i, (ok, rb) in enumerate(leg_b_results)),
+        dtype=np.int64, count=len(leg_b_results))
+    call_idx_arr = np.fromiter(
+        (m[5] for m in leg_b_map), dtype=np.intp, count=len(leg_b_map))
+    amounts_out = call_amounts[call_idx_arr]
+
+    gross_profit_raw = amounts_out - total_repay
+    gross_profit_usd = gross_profit_raw / 10**USDC_DECIMALS
+    spread_pct = gross_profit_raw / FLASHLOAN_USDC_AMOUNT * 100.0
+    profitable_idx, net_profit_usd = _find_profitable(
+        amounts_out, total_repay, float(10**USDC_DECIMALS),
+        gas_cost_usd, MIN_PROFIT_USD)
+
+    valid = amounts_out > 0
+    _update_viability_floors(leg_b_map, amounts_out, valid, total_repay)
+    info_enabled = logger.isEnabledFor(logging.INFO)
+    for idx in np.nonzero(valid & (spread_pct > MIN_SPREAD_LOG_PCT))[0]:
+        symbol, buy_dex, sell_dex, fee, amount_in_token, _ = leg_b_map[idx]
+        if info_enabled:
+            logger.info("%s/USDC | %s->%s | Spread: %.3f%% | Gross: $%.2f",
+                        symbol, buy_dex, sell_dex, spread_pct[idx], gross_profit_usd[idx])
+        try:
+            _spread_queue.put_nowait(
+                (f"{symbol}/USDC", buy_dex, sell_dex, float(spread_pct[idx])))
+        except asyncio.QueueFull:
+            pass
+
+    for idx in profitable_idx:
+        symbol, buy_dex, sell_dex, fee, amount_in_token, _ = leg_b_map[idx]
+        await execute_arbitrage(w3, symbol, buy_dex, sell_dex, fee, float(net_profit_usd[idx]))
+
+    scan_ms = (time.monotonic() - scan_start) * 1000
+    if info_enabled:
+        logger.info("Block %d scanned in %.0fms (%d leg B quotes)",
+                    block_number, scan_ms, len(leg_b_results))
+    try:
+        db_manager.log_metric(block_number, scan_ms, gas_price / 1e9)
+    except Exception:
+        pass
+
+
+async def main() -> None:
+    db_manager.init_db()
+    _build_quoter_templates()
+    asyncio.create_task(_db_writer())
+    rpc = AsyncRPCManager()
+    await rpc.connect()
+    w3 = rpc.get_w3()
+
+    ctx = zmq.asyncio.Context()
+    socket = ctx.socket(zmq.SUB)
+    socket.connect(ZMQ_ADDR)
+    socket.setsockopt_string(zmq.SUBSCRIBE, "")
+    logger.info("🎯 Scanner subscribed to %s", ZMQ_ADDR)
+
+    while True:
+        msg = await socket.recv_string()
+        block_number = int(msg)
+        try:
+            await scan_and_execute(w3, rpc, block_number)
+        except Exception as exc:
+            logger.error("Scan failed on block %d: %s", block_number, exc)
+            await rpc.handle_rate_limit()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,459 @@
+"""War Room — liquidation radar over the sniper's live_targets feed.
+
+Fourth panel in the fleet: where dashboard.py tracks the hunter's own
+KPIs, this one is aimed at the battlefield — a radar scatter of every
+account circling liquidation, tier drill-downs, and the raw terminal
+feed. Reads the same arbitrum_bot.db the bot writes; never writes.
+"""
+
+import json
+import os
+import re
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from queue import Queue
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from config import DB_FILE
+
+try:
+    from streamlit_autorefresh import st_autorefresh
+except ImportError:
+    st_autorefresh = None
+
+try:
+    # Arrow-backed strings: one contiguous buffer instead of a PyObject
+    # per tx hash / token pair cell
+    import pyarrow  # noqa: F401
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+TARGETS_JSON = "targets.json"
+
+st.set_page_config(page_title="War Room", page_icon="🎯", layout="wide")
+
+CSS = """
+<style>
+    .stApp { background-color: #0b0e14; color: #c9d1d9; }
+    [data-testid="stMetricValue"] { color: #ff4b4b; font-family: 'Courier New', monospace; }
+    .terminal-log {
+        background-color: #010409; border: 1px solid #21262d; border-radius: 6px;
+        padding: 12px; font-family: 'Courier New', monospace; font-size: 13px;
+        height: 520px; overflow-y: auto; white-space: pre-wrap;
+    }
+    .log-sniper { color: #ff4b4b; font-weight: bold; }
+    .log-scout { color: #58a6ff; }
+    .log-promoted { color: #d29922; font-weight: bold; }
+    .log-preflight { color: #a371f7; }
+    .log-tx { color: #3fb950; font-weight: bold; }
+    .log-ts { opacity: 0.5; }
+</style>
+"""
+
+# Emitted every run: Streamlit clears elements a rerun doesn't
+# re-produce, so gating this behind a session flag would drop the
+# <style> node on the first autorefresh tick.
+st.markdown(CSS, unsafe_allow_html=True)
+
+st.markdown("## 🎯 WAR ROOM — Liquidation Radar")
+
+
+# --- DB access -------------------------------------------------------------
+
+@st.cache_resource(show_spinner=False)
+def _reader_pool() -> Queue:
+    """Pool of read-only connections, one per CPU, built once per server.
+
+    The panel never writes, and under WAL read-only connections never
+    block behind the bot's writer — mode=ro URIs plus query_only make
+    that contract explicit, so concurrent worker threads can each check
+    out a handle and query in parallel instead of serializing on a
+    single shared connection.
+    """
+    pool: Queue = Queue()
+    for _ in range(os.cpu_count() or 4):
+        conn = sqlite3.connect(f"file:{DB_FILE}?mode=ro&cache=private",
+                               uri=True, check_same_thread=False)
+        conn.executescript(
+            "PRAGMA query_only=1;"
+            "PRAGMA temp_store=MEMORY;"
+            "PRAGMA cache_size=-20000;"
+            "PRAGMA mmap_size=268435456;"
+            "PRAGMA busy_timeout=5000;")
+        pool.put(conn)
+    return pool
+
+
+@st.cache_resource(show_spinner=False)
+def ensure_indexes() -> None:
+    """Covering index so the HF-band queries never touch the base table.
+
+    (health_factor, debt_usd, collateral_usd, address) serves
+    load_tier_rows and the sidebar aggregates as index-only range walks.
+    DDL can't run on the mode=ro pool, so this uses its own short-lived
+    read-write handle once per server process.
+    """
+    conn = sqlite3.connect(DB_FILE, timeout=5.0)
+    try:
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_lt_hf_cov ON live_targets"
+            "(health_factor, debt_usd, collateral_usd, address)")
+        conn.commit()
+    except sqlite3.Error:
+        pass
+    finally:
+        conn.close()
+
+
+@contextmanager
+def get_reader():
+    pool = _reader_pool()
+    conn = pool.get()
+    try:
+        yield conn
+    finally:
+        pool.put(conn)
+
+
+def safe_query(sql: str, params: tuple = (), arrow: bool = False) -> pd.DataFrame:
+    try:
+        with get_reader() as conn:
+            if arrow and HAS_ARROW:
+                return pd.read_sql_query(sql, conn, params=params,
+                                         dtype_backend="pyarrow")
+            return pd.read_sql_query(sql, conn, params=params)
+    except Exception:
+        return pd.DataFrame()
+
+
+def safe_iter(sql: str, params: tuple = ()):
+    """Yield rows in fetchmany batches, no DataFrame in between.
+
+    read_sql_query peaks at several times the rows' final size while it
+    shuffles them through intermediate forms; for the terminal we only
+    walk each row once to build HTML, so streaming tuples straight off
+    the cursor skips that entirely.
+    """
+    try:
+        with get_reader() as conn:
+            cur = conn.execute(sql, params)
+            while True:
+                batch = cur.fetchmany(256)
+                if not batch:
+                    return
+                yield from batch
+    except Exception:
+        return
+
+
+# --- Loaders ---------------------------------------------------------------
+#
+# ttl=5 matches the autorefresh period: within one refresh the radar,
+# danger and watchlist tabs all share a single live_targets scan instead
+# of issuing three identical SELECTs.
+
+@st.cache_data(ttl=5, show_spinner=False)
+def load_tier_rows(lo: float, hi: float, limit: int = 500) -> pd.DataFrame:
+    """Rows in one HF band, filtered and sorted by SQLite.
+
+    The tab blocks used to pull the whole live_targets table and slice
+    it with boolean masks in pandas; pushing the band into WHERE means
+    SQLite touches only the relevant pages and Python only materializes
+    rows that are actually rendered.
+    """
+    return safe_query(
+        "SELECT address, health_factor, debt_usd, collateral_usd "
+        "FROM live_targets "
+        "WHERE health_factor > 0 AND health_factor >= ? AND health_factor < ? "
+        "ORDER BY health_factor ASC LIMIT ?", (lo, hi, limit))
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def load_metrics(limit: int = 200) -> pd.DataFrame:
+    return safe_query(
+        "SELECT timestamp, block_number, scan_ms, gas_price_gwei "
+        "FROM system_metrics ORDER BY id DESC LIMIT ?", (limit,))
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def load_executions(limit: int = 50) -> pd.DataFrame:
+    return safe_query(
+        "SELECT timestamp, token_pair, dex_buy, dex_sell, profit_eth, "
+        "profit_usdc, tx_hash, status FROM arb_executions "
+        "ORDER BY id DESC LIMIT ?", (limit,), arrow=True)
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def load_dashboard_snapshot() -> dict:
+    """Every sidebar KPI from one statement and one fetchone.
+
+    The summary counts, debt total and scan-time average were three
+    separate statements, each paying its own round trip through
+    sqlite3's row-conversion layer; five scalar subqueries in a single
+    SELECT make them one — and, being one statement, they read one
+    consistent snapshot of the database (the pool's read-only handles
+    cannot take BEGIN IMMEDIATE, nor need to). The profit sums come
+    from load_total_profits so its keyed incremental cache keeps
+    skipping the aggregate scan between executions.
+    """
+    try:
+        with get_reader() as conn:
+            row = conn.execute(
+                "SELECT"
+                " (SELECT COUNT(*) FROM live_targets),"
+                " (SELECT COALESCE(SUM(debt_usd), 0) FROM live_targets),"
+                " (SELECT COUNT(*) FROM live_targets"
+                "    WHERE health_factor > 0 AND health_factor < 1.05),"
+                " (SELECT COUNT(*) FROM live_targets"
+                "    WHERE health_factor >= 1.05 AND health_factor < 1.20),"
+                " (SELECT COALESCE(AVG(scan_ms), 0) FROM"
+                "    (SELECT scan_ms FROM system_metrics ORDER BY id DESC LIMIT 100)),"
+                " (SELECT COUNT(*) FROM live_targets"
+                "    WHERE health_factor > 0 AND health_factor < 1.0),"
+                " (SELECT COUNT(*) FROM live_targets"
+                "    WHERE health_factor > 0 AND health_factor < 1.25)"
+            ).fetchone()
+    except Exception:
+        row = (0, 0.0, 0, 0, 0.0, 0, 0)
+    profit_eth, profit_usdc = load_total_profits()
+    return {"total": int(row[0]), "total_debt": float(row[1]),
+            "danger": int(row[2]), "watch": int(row[3]),
+            "avg_scan_ms": float(row[4]),
+            "liquidatable": int(row[5]), "on_radar": int(row[6]),
+            "profit_eth": profit_eth, "profit_usdc": profit_usdc}
+
+
+@st.cache_data(show_spinner=False)
+def _sum_profits(key: tuple) -> tuple:
+    """The actual aggregate, memoized against the freshness key.
+
+    arb_executions is append-only, so (MAX(id), COUNT(*)) changes iff a
+    row landed; while it doesn't, every caller gets the cached sums back
+    without re-scanning the table.
+    """
+    with get_reader() as conn:
+        row = conn.execute(
+            "SELECT COALESCE(SUM(profit_eth), 0), COALESCE(SUM(profit_usdc), 0) "
+            "FROM arb_executions").fetchone()
+    return float(row[0]), float(row[1])
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def load_total_profits() -> tuple:
+    try:
+        with get_reader() as conn:
+            key = conn.execute(
+                "SELECT COALESCE(MAX(id), 0), COUNT(*) FROM arb_executions"
+            ).fetchone()
+        return _sum_profits(tuple(key))
+    except Exception:
+        return 0.0, 0.0
+
+
+@st.cache_data(show_spinner=False)
+def _parse_targets_json(path: str, mtime: float) -> dict:
+    """mtime keys the cache: an unchanged file costs a stat(), no parse."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_targets_json() -> dict:
+    try:
+        return _parse_targets_json(TARGETS_JSON, os.path.getmtime(TARGETS_JSON))
+    except (OSError, ValueError):
+        return {}
+
+
+@st.cache_resource(show_spinner=False)
+def _loader_pool() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="war-room-loader")
+
+
+# --- Log highlighting ------------------------------------------------------
+
+# Single alternation compiled once: one linear scan per line instead of
+# five substring probes plus up to five separate re.sub passes.
+_LOG_RE = re.compile(
+    r"\[SNIPER\]|\[SCOUT\]|PROMOTED|PRE-FLIGHT|SIMULATION|SIMULATE|"
+    r"TX SENT|TX CONFIRMED|TX REVERTED", re.IGNORECASE)
+
+_CLASS_MAP = {
+    "[sniper]": "log-sniper",
+    "[scout]": "log-scout",
+    "promoted": "log-promoted",
+    "pre-flight": "log-preflight",
+    "simulation": "log-preflight",
+    "simulate": "log-preflight",
+    "tx sent": "log-tx",
+    "tx confirmed": "log-tx",
+    "tx reverted": "log-tx",
+}
+
+# C-level escape via translate instead of three chained str.replace
+_HTML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
+
+def _wrap_match(m: re.Match) -> str:
+    token = m.group(0)
+    return f'<span class="{_CLASS_MAP[token.lower()]}">{token}</span>'
+
+
+def highlight_log_line(msg: str, level: str) -> str:
+    return _LOG_RE.sub(_wrap_match, msg.translate(_HTML_ESCAPE))
+
+
+def _render_tier_table(df: pd.DataFrame) -> None:
+    """Tier drill-down table with vectorized display columns.
+
+    Address truncation and currency formatting used to run a Python
+    lambda per cell via .apply; the .str ops and map(format) below stay
+    at C level across the whole column.
+    """
+    disp = df.rename(columns={
+        "address": "Address", "health_factor": "HF",
+        "debt_usd": "Debt (USD)", "collateral_usd": "Collateral (USD)"})
+    addr = disp["Address"]
+    disp["Address"] = np.where(
+        addr.str.len() > 14,
+        addr.str.slice(0, 8) + "..." + addr.str.slice(-6), addr)
+    disp["Debt (USD)"] = disp["Debt (USD)"].map("${:,.2f}".format)
+    disp["Collateral (USD)"] = disp["Collateral (USD)"].map("${:,.2f}".format)
+    st.dataframe(disp[["Address", "HF", "Debt (USD)", "Collateral (USD)"]],
+                 use_container_width=True, hide_index=True)
+
+
+# --- Sidebar ---------------------------------------------------------------
+
+with st.sidebar:
+    st.markdown("### ⚔️ Battle Status")
+    snap = load_dashboard_snapshot()
+    st.metric("Tracked Targets", snap["total"])
+    st.metric("🔴 Tier 1 (Danger)", snap["danger"])
+    st.metric("🟠 Tier 2 (Watchlist)", snap["watch"])
+    st.metric("Total Debt", f"${snap['total_debt']:,.0f}")
+    st.metric("Profit (ETH)", f"{snap['profit_eth']:.4f}")
+    st.metric("Profit (USDC)", f"${snap['profit_usdc']:,.2f}")
+    st.metric("Avg Scan", f"{snap['avg_scan_ms']:.0f} ms")
+    st.caption(f"Last Update: {datetime.now():%H:%M:%S}")
+
+if st_autorefresh is not None:
+    st_autorefresh(interval=5000, key="war_room_refresh")
+
+
+# --- Tabs ------------------------------------------------------------------
+
+ensure_indexes()
+
+# The tab frames are independent, so fire them concurrently on the
+# reader pool; each worker thread checks out its own mode=ro connection.
+_pool = _loader_pool()
+_fut_radar = _pool.submit(load_tier_rows, 0.0, 1.25)
+_fut_tier1 = _pool.submit(load_tier_rows, 0.0, 1.05)
+_fut_tier2 = _pool.submit(load_tier_rows, 1.05, 1.20)
+_fut_metrics = _pool.submit(load_metrics, 200)
+_fut_exec = _pool.submit(load_executions, 50)
+df_radar = _fut_radar.result()
+tier1 = _fut_tier1.result()
+tier2 = _fut_tier2.result()
+df_metrics = _fut_metrics.result()
+df_exec = _fut_exec.result()
+
+tab_radar, tab_danger, tab_watch, tab_perf, tab_exec, tab_term = st.tabs(
+    ["📡 Radar", "🔴 Tier 1 Danger", "🟠 Tier 2 Watchlist",
+     "📈 Performance", "💰 Executions", "🖥️ Terminal"])
+
+with tab_radar:
+    if df_radar.empty:
+        st.info("No targets on radar.")
+    else:
+        df_radar["tier"] = np.where(df_radar["health_factor"].to_numpy() < 1.05,
+                                    "🔴 Tier 1 (Danger)", "🟠 Tier 2 (Watchlist)")
+        addr = df_radar["address"]
+        df_radar["short_addr"] = np.where(
+            addr.str.len() > 14,
+            addr.str.slice(0, 8) + "..." + addr.str.slice(-6), addr)
+        fig = px.scatter(
+            df_radar, x="debt_usd", y="health_factor", color="tier",
+            hover_name="short_addr", log_x=True,
+            color_discrete_map={"🔴 Tier 1 (Danger)": "#ff4b4b",
+                                "🟠 Tier 2 (Watchlist)": "#d29922"},
+            labels={"debt_usd": "Debt (USD)", "health_factor": "Health Factor"})
+        fig.add_hline(y=1.0, line_dash="dash", line_color="#ff4b4b")
+        fig.update_layout(template="plotly_dark", height=480,
+                          paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)")
+        st.plotly_chart(fig, use_container_width=True)
+        # counted in SQL, not from df_radar: the scatter frame is capped
+        # at LIMIT 500, so frame-derived counts would saturate there and
+        # drift from the sidebar once a band outgrows the cap
+        snap = load_dashboard_snapshot()
+        rc1, rc2, rc3, rc4 = st.columns(4)
+        rc1.metric("Liquidatable (HF<1)", snap["liquidatable"])
+        rc2.metric("In Danger Band", snap["danger"])
+        rc3.metric("On Watchlist", snap["on_radar"] - snap["danger"])
+        rc4.metric("On Radar", snap["on_radar"])
+
+with tab_danger:
+    if tier1.empty:
+        tier1 = pd.DataFrame(load_targets_json().get("tier_1_danger", []))
+        if not tier1.empty:
+            st.caption("DB empty — showing targets.json snapshot")
+    if tier1.empty:
+        st.success("No targets in the danger band.")
+    else:
+        _render_tier_table(tier1)
+
+with tab_watch:
+    if tier2.empty:
+        tier2 = pd.DataFrame(load_targets_json().get("tier_2_watchlist", []))
+        if not tier2.empty:
+            st.caption("DB empty — showing targets.json snapshot")
+    if tier2.empty:
+        st.info("Watchlist is empty.")
+    else:
+        _render_tier_table(tier2)
+
+with tab_perf:
+    if df_metrics.empty:
+        st.info("No metrics yet.")
+    else:
+        df_metrics = df_metrics.iloc[::-1]
+        fig = px.line(df_metrics, x="block_number", y="scan_ms",
+                      labels={"block_number": "Block", "scan_ms": "Scan (ms)"})
+        fig.update_layout(template="plotly_dark", height=300,
+                          paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)")
+        st.plotly_chart(fig, use_container_width=True)
+        fig2 = px.bar(df_metrics, x="block_number", y="gas_price_gwei",
+                      labels={"block_number": "Block", "gas_price_gwei": "Gas (gwei)"})
+        fig2.update_layout(template="plotly_dark", height=300,
+                           paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)")
+        st.plotly_chart(fig2, use_container_width=True)
+
+with tab_exec:
+    profit_eth, profit_usdc = load_total_profits()
+    ec1, ec2 = st.columns(2)
+    ec1.metric("Total Profit (ETH)", f"{profit_eth:.4f}")
+    ec2.metric("Total Profit (USDC)", f"${profit_usdc:,.2f}")
+    if df_exec.empty:
+        st.info("No executions yet.")
+    else:
+        st.dataframe(df_exec, use_container_width=True, hide_index=True)
+
+with tab_term:
+    log_lines = [
+        f'<span class="log-ts">[{ts}]</span> '
+        f'{highlight_log_line(str(msg), str(level))}'
+        for ts, level, msg in safe_iter(
+            "SELECT timestamp, level, message FROM logs "
+            "ORDER BY id DESC LIMIT ?", (300,))]
+    if not log_lines:
+        st.info("No logs yet.")
+    else:
+        st.markdown(f'<div class="terminal-log">{"<br>".join(log_lines)}</div>',
+                    unsafe_allow_html=True)